@@ -19,8 +19,8 @@ from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field
 
 from datahub.fetcher import get_candles_batch, get_latest_candles, get_quote_summary
-from datahub.indicators import compute_all
-from datahub.macro import get_macro_snapshot
+from datahub.indicators import compute_all, warmup_kernels
+from datahub.macro import aclose_http_clients, get_macro_snapshot
 from datahub.scanner import scan_opportunities
 from datahub.watchlist import Watchlist, load_watchlist, save_watchlist
 from engine.analyzer import analyze_snapshot
@@ -208,6 +208,20 @@ app.include_router(analyze_router)
 app.include_router(analyze_router, prefix="/api")
 
 
+@app.on_event("startup")
+async def _warmup_indicator_kernels() -> None:
+    # 在后台线程中完成指标内核的 JIT/缓存加载，首个分析请求不再承担编译耗时
+    try:
+        await asyncio.to_thread(warmup_kernels)
+    except Exception as exc:  # pragma: no cover - 预热失败不影响服务
+        logger.warning("Indicator kernel warmup failed: %s", exc)
+
+
+@app.on_event("shutdown")
+async def _close_http_clients() -> None:
+    await aclose_http_clients()
+
+
 @app.get("/healthz")
 async def health_check() -> Dict[str, str]:
     return {"status": "ok"}
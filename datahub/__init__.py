@@ -2,13 +2,14 @@
 
 from .cache import DataCache  # noqa: F401
 from .fetcher import get_candles_batch, get_latest_candles, get_quote_summary  # noqa: F401
-from .indicators import compute_all  # noqa: F401
+from .indicators import IndicatorState, compute_all, compute_all_batch, update_all  # noqa: F401
 from .providers import (  # noqa: F401
     AkShareProvider,
     AkShareUSProvider,
     CandleProvider,
     ProviderError,
     default_providers,
+    invalidate_providers_cache,
     load_akshare_provider,
     load_akshare_us_provider,
 )
@@ -26,8 +27,10 @@ __all__ = [
     "AkShareUSProvider",
     "CandleProvider",
     "DataCache",
+    "IndicatorState",
     "ProviderError",
     "compute_all",
+    "compute_all_batch",
     "default_providers",
     "get_index_snapshot",
     "get_macro_snapshot",
@@ -36,10 +39,12 @@ __all__ = [
     "get_candles_batch",
     "get_latest_candles",
     "get_quote_summary",
+    "invalidate_providers_cache",
     "load_akshare_provider",
     "load_akshare_us_provider",
     "scan_opportunities",
     "load_watchlist",
     "save_watchlist",
+    "update_all",
     "Watchlist",
 ]
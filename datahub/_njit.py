@@ -0,0 +1,30 @@
+"""
+numba 可选加速适配。
+
+安装了 numba 时 ``njit`` 即 ``numba.njit``；缺失时退化为原样返回被装饰函数，
+指标内核以纯 Python 循环运行，结果一致但速度较慢。
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+try:  # pragma: no cover - 可选依赖
+    import numba  # type: ignore
+except ImportError:  # pragma: no cover
+    numba = None  # type: ignore
+
+NUMBA_AVAILABLE = numba is not None
+
+
+def njit(*args: Any, **kwargs: Any) -> Any:
+    """兼容 ``@njit`` 与 ``@njit(cache=True, ...)`` 两种写法。"""
+    if numba is not None:
+        return numba.njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        return func
+
+    return decorator
@@ -14,7 +14,9 @@ import logging
 from functools import lru_cache
 import os
 import time
+from datetime import timezone, tzinfo
 from typing import Any, Dict, Iterable, List, Optional, Sequence
+from zoneinfo import ZoneInfo
 
 import pandas as pd
 from requests import exceptions as req_exc
@@ -127,16 +129,25 @@ def _maybe_disable_proxy() -> bool:
     return False
 
 
+@lru_cache(maxsize=None)
+def _tzinfo(name: Optional[str]) -> tzinfo:
+    """时区名称解析为 tzinfo 并缓存，避免每次本地化时重复查找时区数据库。"""
+    return ZoneInfo(name) if name else timezone.utc
+
+
 def _normalize_ohlcv(
     df: Optional[pd.DataFrame],
     rename_map: Dict[str, str],
     tz: Optional[str],
 ) -> pd.DataFrame:
-    """统一将行情数据转换为 UTC 时间索引的 OHLCV 结构。"""
+    """统一将行情数据转换为 UTC 时间索引的 OHLCV 结构。
+
+    df 为 _call 新拉取的结果，调用方不再持有，直接原地整理，无需防御性拷贝。
+    """
     if df is None or df.empty:
         return pd.DataFrame()
 
-    data = df.copy()
+    data = df
     # 某些接口返回多重索引，需要先扁平化
     if isinstance(data.columns, pd.MultiIndex):
         data.columns = [str(col[-1]) if isinstance(col, tuple) else str(col) for col in data.columns]
@@ -159,31 +170,26 @@ def _normalize_ohlcv(
     if "Datetime" not in data.columns:
         raise ValueError("行情数据缺少 Datetime 列，无法标准化。")
 
-    data["Datetime"] = pd.to_datetime(data["Datetime"], errors="coerce")
-    data = data.dropna(subset=["Datetime"])
-
-    if data.empty:
-        return pd.DataFrame()
-
-    dt_series = data["Datetime"]
+    # 列赋值均在筛行之前完成：筛行得到的是切片，再赋值会触发 SettingWithCopyWarning
+    dt_series = pd.to_datetime(data["Datetime"], errors="coerce")
     if getattr(dt_series.dt, "tz", None) is None:
-        target_tz = tz or "UTC"
-        data["Datetime"] = dt_series.dt.tz_localize(
-            target_tz,
+        dt_series = dt_series.dt.tz_localize(
+            _tzinfo(tz),
             nonexistent="shift_forward",
             ambiguous="NaT",
         )
-    if tz is not None:
-        data["Datetime"] = data["Datetime"].dt.tz_convert("UTC")
-    else:
-        data["Datetime"] = data["Datetime"].dt.tz_convert("UTC")
+    data["Datetime"] = dt_series.dt.tz_convert(timezone.utc)
 
+    # 多数接口已返回数值列，仅对仍为 object/字符串的列做解析；保持 float64 以免价格精度损失
     numeric_cols = ["Open", "High", "Low", "Close", "Volume"]
     for col in numeric_cols:
-        if col in data.columns:
+        if col in data.columns and not pd.api.types.is_numeric_dtype(data[col]):
             data[col] = pd.to_numeric(data[col], errors="coerce")
 
     data = data.dropna(subset=["Datetime"])
+    if data.empty:
+        return pd.DataFrame()
+
     data = data.set_index("Datetime")
     data = data.loc[:, ~data.columns.duplicated()]
     data.sort_index(inplace=True)
@@ -289,7 +295,7 @@ def fetch_sector_fund_flow(period: str = "今日") -> pd.DataFrame:
     if df is None or df.empty:
         return pd.DataFrame()
 
-    data = df.copy()
+    data = df
     rename_map = {
         "行业名称": "name",
         "行业代码": "code",
@@ -326,7 +332,7 @@ def fetch_sector_flow_detail(symbol: str) -> pd.DataFrame:
     df = _call("stock_sector_fund_flow_rank_detail", symbol)
     if df is None or df.empty:
         return pd.DataFrame()
-    data = df.copy()
+    data = df
     rename_map = {
         "股票代码": "code",
         "证券代码": "code",
@@ -352,7 +358,7 @@ def fetch_market_spot() -> pd.DataFrame:
     返回 A 股实时行情快照，可用于统计涨跌家数。
     """
     df = _call("stock_zh_a_spot_em")
-    return df.copy() if df is not None else pd.DataFrame()
+    return df if df is not None else pd.DataFrame()
 
 
 def fetch_northbound_intraday(symbol: str = "北向资金") -> pd.DataFrame:
@@ -364,8 +370,7 @@ def fetch_northbound_intraday(symbol: str = "北向资金") -> pd.DataFrame:
     df = _call("stock_hsgt_fund_min_em", symbol=symbol)
     if df is None or df.empty:
         return pd.DataFrame()
-    data = df.copy()
-    return data
+    return df
 
 
 def fetch_lhb_summary(date: str) -> pd.DataFrame:
@@ -374,12 +379,12 @@ def fetch_lhb_summary(date: str) -> pd.DataFrame:
     date 形如 20240101。
     """
     df = _call("stock_lhb_ggtj_em", date)
-    return df.copy() if df is not None else pd.DataFrame()
+    return df if df is not None else pd.DataFrame()
 
 
 def fetch_stock_news(page: int = 1) -> pd.DataFrame:
     df = _call("stock_news_em", page)
-    return df.copy() if df is not None else pd.DataFrame()
+    return df if df is not None else pd.DataFrame()
 
 
 def _to_float(value: Any) -> float:
@@ -409,4 +414,4 @@ def fetch_hsgt_board_rank(symbol: str = "北向资金增持行业板块排行",
     df = _call("stock_hsgt_board_rank_em", symbol=symbol, indicator=indicator)
     if df is None or df.empty:
         return pd.DataFrame()
-    return df.copy()
+    return df
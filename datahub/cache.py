@@ -1,20 +1,29 @@
 """
 基于文件的行情数据缓存工具。
 
-在可用时优先使用 Parquet 存储 pandas DataFrame；若缺少 pyarrow，
-则退化为 CSV。缓存按股票与时间粒度区分，并通过 TTL 校验有效期。
+在可用时优先使用 Arrow IPC (Feather, LZ4 压缩) 存储 pandas DataFrame，
+读写开销低于 Parquet；旧版 Parquet 缓存仍可读取，若缺少 pyarrow 则退化为
+CSV。文件先写临时文件再原子替换，读取失败按未命中处理。缓存按股票与时间
+粒度区分，并通过 TTL 校验有效期。
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import os
+import threading
 import time
 from pathlib import Path
 from typing import Optional
 
 import pandas as pd
 
+try:  # pragma: no cover - 可选依赖
+    from pyarrow import feather  # type: ignore
+except ImportError:  # pragma: no cover
+    feather = None  # type: ignore
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +45,9 @@ class DataCache:
         return self.base_dir / timeframe / safe_ticker
 
     def _primary_path(self, ticker: str, timeframe: str, provider: str) -> Path:
+        return self._base_path(ticker, timeframe, provider).with_suffix(".feather")
+
+    def _parquet_path(self, ticker: str, timeframe: str, provider: str) -> Path:
         return self._base_path(ticker, timeframe, provider).with_suffix(".parquet")
 
     def _fallback_path(self, ticker: str, timeframe: str, provider: str) -> Path:
@@ -46,26 +58,29 @@ class DataCache:
 
     def load(self, ticker: str, timeframe: str, provider: str = "default") -> Optional[pd.DataFrame]:
         """加载指定提供方的缓存数据。"""
-        path = self._primary_path(ticker, timeframe, provider)
-        csv_path = self._fallback_path(ticker, timeframe, provider)
-
-        if not path.exists() and not csv_path.exists():
+        candidates = [
+            self._primary_path(ticker, timeframe, provider),
+            self._parquet_path(ticker, timeframe, provider),
+            self._fallback_path(ticker, timeframe, provider),
+        ]
+        path = next((item for item in candidates if item.exists()), None)
+
+        if path is None:
             # 兼容旧版缓存目录结构
-            legacy_path = self._legacy_base_path(ticker, timeframe).with_suffix(".parquet")
-            legacy_csv = self._legacy_base_path(ticker, timeframe).with_suffix(".csv")
-            if legacy_path.exists():
-                path = legacy_path
-            elif legacy_csv.exists():
-                csv_path = legacy_csv
-            else:
+            legacy_base = self._legacy_base_path(ticker, timeframe)
+            legacy = [legacy_base.with_suffix(".parquet"), legacy_base.with_suffix(".csv")]
+            path = next((item for item in legacy if item.exists()), None)
+            if path is None:
                 return None
 
         if self.is_stale(ticker, timeframe, provider):
             return None
 
-        if path.exists():
+        try:
             return self._read_dataframe(path)
-        return self._read_dataframe(csv_path)
+        except Exception as exc:
+            logger.warning("读取缓存失败，按未命中处理 %s: %s", path, exc)
+            return None
 
     def store(self, ticker: str, timeframe: str, df: pd.DataFrame, provider: str = "default") -> None:
         """写入 DataFrame 并记录缓存时间戳。"""
@@ -73,16 +88,32 @@ class DataCache:
             logger.debug("跳过缓存空数据：%s %s (%s)", ticker, timeframe, provider)
             return
 
-        parquet_path = self._primary_path(ticker, timeframe, provider)
-        parquet_path.parent.mkdir(parents=True, exist_ok=True)
-        wrote = self._write_dataframe(parquet_path, df)
-        if not wrote:
-            csv_path = self._fallback_path(ticker, timeframe, provider)
-            df.to_csv(csv_path)
+        candidates = (
+            self._primary_path(ticker, timeframe, provider),
+            self._parquet_path(ticker, timeframe, provider),
+            self._fallback_path(ticker, timeframe, provider),
+        )
+        candidates[0].parent.mkdir(parents=True, exist_ok=True)
+        written = next((path for path in candidates if self._write_dataframe(path, df)), None)
+        if written is None:
+            logger.warning("缓存写入失败：%s %s (%s)", ticker, timeframe, provider)
+            return
+
+        # load 按 Feather → Parquet → CSV 顺序取首个存在的文件，
+        # 需删除其他格式的旧文件，避免新元信息为旧数据背书
+        for stale in candidates:
+            if stale != written:
+                stale.unlink(missing_ok=True)
 
         metadata_path = self._metadata_path(ticker, timeframe, provider)
         metadata = {"cached_at": int(time.time()), "provider": provider, "rows": int(len(df))}
-        metadata_path.write_text(json.dumps(metadata), encoding="utf-8")
+        tmp = _tmp_path(metadata_path)
+        try:
+            tmp.write_text(json.dumps(metadata), encoding="utf-8")
+            os.replace(tmp, metadata_path)
+        except OSError as exc:  # pragma: no cover
+            logger.warning("缓存元信息写入失败 %s: %s", metadata_path, exc)
+            tmp.unlink(missing_ok=True)
 
     def is_stale(self, ticker: str, timeframe: str, provider: str = "default") -> bool:
         """判断缓存是否过期或不存在。"""
@@ -106,14 +137,15 @@ class DataCache:
 
     def clear(self, ticker: str, timeframe: str, provider: str = "default") -> None:
         """清理指定提供方的缓存文件。"""
-        metadata_path = self._metadata_path(ticker, timeframe, provider)
-        path = self._primary_path(ticker, timeframe, provider)
-        for target in (path, metadata_path):
+        targets = (
+            self._primary_path(ticker, timeframe, provider),
+            self._parquet_path(ticker, timeframe, provider),
+            self._fallback_path(ticker, timeframe, provider),
+            self._metadata_path(ticker, timeframe, provider),
+        )
+        for target in targets:
             if target.exists():
                 target.unlink()
-        csv_path = self._fallback_path(ticker, timeframe, provider)
-        if csv_path.exists():
-            csv_path.unlink()
 
         # 同步清理历史目录
         legacy_base = self._legacy_base_path(ticker, timeframe)
@@ -124,6 +156,17 @@ class DataCache:
 
     @staticmethod
     def _read_dataframe(path: Path) -> pd.DataFrame:
+        if path.suffix == ".feather" and feather is not None:
+            try:
+                table = feather.read_table(path, memory_map=True)
+                data = table.to_pandas()
+                index_col = data.columns[0]
+                data = data.set_index(index_col)
+                if index_col == "index":
+                    data.index.name = None
+                return data
+            except Exception as exc:  # pragma: no cover - 极少触发
+                logger.warning("读取 Feather 缓存失败 %s: %s", path, exc)
         if path.suffix == ".parquet":
             try:
                 return pd.read_parquet(path)
@@ -135,9 +178,25 @@ class DataCache:
 
     @staticmethod
     def _write_dataframe(path: Path, df: pd.DataFrame) -> bool:
+        """写入临时文件后原子替换，读者不会看到写了一半的文件。"""
+        if path.suffix == ".feather" and feather is None:
+            return False
+        tmp = _tmp_path(path)
         try:
-            df.to_parquet(path)
+            if path.suffix == ".feather":
+                # Feather 仅支持默认 RangeIndex，时间索引以首列形式落盘
+                feather.write_feather(df.reset_index(), tmp, compression="lz4")
+            elif path.suffix == ".parquet":
+                df.to_parquet(tmp)
+            else:
+                df.to_csv(tmp)
+            os.replace(tmp, path)
             return True
-        except Exception as exc:  # pragma: no cover - 无 pyarrow 时触发
-            logger.debug("写入 Parquet 失败 %s: %s，改用 CSV", path, exc)
+        except Exception as exc:  # pragma: no cover - 无 pyarrow 或列结构不受支持时触发
+            logger.debug("写入 %s 失败 %s: %s，改用下一种格式", path.suffix, path, exc)
+            tmp.unlink(missing_ok=True)
             return False
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
@@ -10,10 +10,12 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import time
 from datetime import datetime, timedelta, timezone
 from functools import lru_cache
 from typing import Any, Dict, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 from pandas import Series
 import yfinance as yf
@@ -58,8 +60,20 @@ PROVIDER_TTL_OVERRIDES: Dict[str, Dict[str, int]] = {
     },
 }
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NS_PER_SECOND = 1_000_000_000
+_INTERVAL_NS: Dict[str, int] = {
+    "1m": 60 * _NS_PER_SECOND,
+    "5m": 5 * 60 * _NS_PER_SECOND,
+    "15m": 15 * 60 * _NS_PER_SECOND,
+    "1h": 60 * 60 * _NS_PER_SECOND,
+    "1d": 24 * 60 * 60 * _NS_PER_SECOND,
+}
+
 
+@lru_cache(maxsize=64)
 def _select_cache(interval: str, provider: str) -> DataCache:
+    """按周期与提供方复用 DataCache 实例，避免每次请求重复构造。"""
     base_ttl = INTERVAL_TTL.get(interval, 60 * 60 * 24)
     provider_ttl = PROVIDER_TTL_OVERRIDES.get(provider, {}).get(interval, base_ttl)
     return DataCache(base_dir="cache", ttl_seconds=provider_ttl)
@@ -75,6 +89,11 @@ def _ensure_datetime(value: Optional[str | datetime]) -> Optional[datetime]:
     return datetime.fromisoformat(value).astimezone(timezone.utc)
 
 
+def _datetime_to_ns(value: datetime) -> int:
+    """将带时区的 datetime 精确转换为纪元纳秒整数。"""
+    return (value - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
 def _needs_refresh(
     df: Optional[pd.DataFrame],
     interval: str,
@@ -82,28 +101,44 @@ def _needs_refresh(
 ) -> bool:
     if df is None or df.empty:
         return True
-    last_idx = df.index[-1]
-    if not isinstance(last_idx, datetime):
+    index = df.index
+    if not isinstance(index, pd.DatetimeIndex):
         logger.debug("Cached dataframe index is not datetime; refreshing.")
         return True
-    now = datetime.now(timezone.utc)
-    expected_delta = {
-        "1m": timedelta(minutes=1),
-        "5m": timedelta(minutes=5),
-        "15m": timedelta(minutes=15),
-        "1h": timedelta(hours=1),
-        "1d": timedelta(days=1),
-    }.get(interval, timedelta(days=1))
-
-    tolerance = expected_delta * 2
+    # 直接比较底层 int64 纳秒时间戳，避免装箱为 Timestamp 对象；
+    # Feather/Parquet 读回的索引可能是 s/ms/us 精度，先把末位统一到纳秒
+    last_ns = int(index[-1:].as_unit("ns").asi8[0])
+    expected_ns = _INTERVAL_NS.get(interval, _INTERVAL_NS["1d"])
 
-    if end is not None and last_idx >= end - expected_delta:
+    if end is not None and last_ns >= _datetime_to_ns(end) - expected_ns:
         return False
-    if now - last_idx > tolerance:
+    if time.time_ns() - last_ns > expected_ns * 2:
         return True
     return False
 
 
+def _dedupe_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """去除重复列、保证索引有序且唯一；数据已规整时原样返回，不产生拷贝。"""
+    if not df.columns.is_unique:
+        df = df.loc[:, ~df.columns.duplicated()]
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind="mergesort")
+    if not df.index.is_unique:
+        df = df.loc[~df.index.duplicated(keep="last")]
+    return df
+
+
+def _last_of_each_key(index: pd.Index) -> np.ndarray:
+    """返回已排序索引中每段相同键的最后一个位置。"""
+    values = index.values
+    if len(values) == 0:
+        return np.empty(0, dtype=np.intp)
+    keep_mask = np.empty(len(values), dtype=bool)
+    keep_mask[:-1] = values[:-1] != values[1:]
+    keep_mask[-1] = True
+    return np.flatnonzero(keep_mask)
+
+
 def _normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
@@ -136,10 +171,28 @@ async def get_latest_candles(
     """获取股票的 OHLCV 数据，并合并本地缓存及多提供方数据。"""
 
     interval = interval or "1d"
-    start_ts = _ensure_datetime(start)
-    end_ts = _ensure_datetime(end)
-
-    provider_sequence = _resolve_providers(ticker, interval, providers)
+    return await _get_latest_candles_with_providers(
+        ticker,
+        _resolve_providers(ticker, interval, providers),
+        start_ts=_ensure_datetime(start),
+        end_ts=_ensure_datetime(end),
+        interval=interval,
+        use_cache=use_cache,
+        force_refresh=force_refresh,
+    )
+
+
+async def _get_latest_candles_with_providers(
+    ticker: str,
+    provider_sequence: Sequence[CandleProvider],
+    *,
+    start_ts: Optional[datetime],
+    end_ts: Optional[datetime],
+    interval: str,
+    use_cache: bool,
+    force_refresh: bool,
+) -> pd.DataFrame:
+    """按已解析好的数据源顺序获取行情，供单只与批量查询共用。"""
     last_error: Optional[Exception] = None
 
     for provider in provider_sequence:
@@ -148,7 +201,12 @@ async def get_latest_candles(
 
         if use_cache:
             if not force_refresh:
-                hot_df = cache_manager.load_dataframe(provider.name, ticker, interval)
+                hot_df = await asyncio.to_thread(
+                    cache_manager.load_dataframe,
+                    provider.name,
+                    ticker,
+                    interval,
+                )
                 if hot_df is not None:
                     hot_df = _normalize_dataframe(hot_df)
                     if not _needs_refresh(hot_df, interval, end_ts):
@@ -157,12 +215,17 @@ async def get_latest_candles(
                         return clipped
                     cached_df = hot_df
 
-            disk_df = cache.load(ticker, interval, provider=provider.name)
+            try:
+                disk_df = await asyncio.to_thread(cache.load, ticker, interval, provider=provider.name)
+            except Exception as exc:  # pragma: no cover - 单个缓存文件损坏不应拖垮整批请求
+                logger.warning("读取 %s 磁盘缓存失败 %s/%s：%s", provider.name, ticker, interval, exc)
+                disk_df = None
             if disk_df is not None:
                 disk_df = _normalize_dataframe(disk_df)
                 cached_df = disk_df
                 ttl_seconds = cache_manager.ttl_for_interval(interval)
-                cache_manager.store_dataframe(
+                await asyncio.to_thread(
+                    cache_manager.store_dataframe,
                     provider.name,
                     ticker,
                     interval,
@@ -202,26 +265,27 @@ async def get_latest_candles(
                 return clipped
             continue
 
-        df = fresh_df.copy()
-        df = df.loc[:, ~df.columns.duplicated()]
-        df = df.sort_index()
-        df = df.loc[~df.index.duplicated(keep="last")]
+        df = _dedupe_frame(fresh_df)
         if cached_df is not None and not cached_df.empty:
-            cached_df = cached_df.loc[~cached_df.index.duplicated(keep="last")]
-            try:
-                combined = pd.concat([cached_df, df], axis=0, join="outer", sort=True)
-            except ValueError:
-                cached_df = cached_df.loc[:, ~cached_df.columns.duplicated()]
-                combined = pd.concat([cached_df, df], axis=0, join="outer", sort=True)
-            combined = combined.loc[:, ~combined.columns.duplicated()]
-            combined.sort_index(inplace=True)
-            df = combined.groupby(level=0).last()
+            # 两侧列名均已唯一，外连接后的列集合同样唯一，无需再次去重
+            combined = pd.concat(
+                [_dedupe_frame(cached_df), df],
+                axis=0,
+                join="outer",
+                sort=False,
+                copy=False,
+            )
+            # 稳定排序保证同一时间戳下新数据排在缓存数据之后
+            combined.sort_index(inplace=True, kind="mergesort")
+            df = combined.iloc[_last_of_each_key(combined.index)]
 
         if df.empty:
             continue
 
-        cache.store(ticker, interval, df, provider=provider.name)
-        cache_manager.store_dataframe(
+        # 落盘与 Redis/Mongo 写入同样放到线程中，避免阻塞事件循环上的其它标的
+        await asyncio.to_thread(cache.store, ticker, interval, df, provider=provider.name)
+        await asyncio.to_thread(
+            cache_manager.store_dataframe,
             provider.name,
             ticker,
             interval,
@@ -248,25 +312,39 @@ async def get_candles_batch(
     concurrency: int = 4,
 ) -> Dict[str, pd.DataFrame]:
     """批量获取多只股票的行情数据。"""
+    interval = interval or "1d"
+    start_ts = _ensure_datetime(start)
+    end_ts = _ensure_datetime(end)
     semaphore = asyncio.Semaphore(max(1, concurrency))
     tasks = []
     results: Dict[str, pd.DataFrame] = {}
 
-    async def _worker(symbol: str) -> None:
+    # 同一市场的标的数据源顺序一致，按市场分组只解析一次
+    resolved: Dict[Optional[str], Sequence[CandleProvider]] = {}
+
+    def _providers_for(symbol: str) -> Sequence[CandleProvider]:
+        market = None if providers else _classify_market(symbol)
+        sequence = resolved.get(market)
+        if sequence is None:
+            sequence = _resolve_market_providers(market, interval, providers)
+            resolved[market] = sequence
+        return sequence
+
+    async def _worker(symbol: str, provider_sequence: Sequence[CandleProvider]) -> None:
         async with semaphore:
-            df = await get_latest_candles(
-                ticker=symbol,
-                start=start,
-                end=end,
+            df = await _get_latest_candles_with_providers(
+                symbol,
+                provider_sequence,
+                start_ts=start_ts,
+                end_ts=end_ts,
                 interval=interval,
                 use_cache=use_cache,
                 force_refresh=force_refresh,
-                providers=providers,
             )
             results[symbol] = df
 
     for ticker in tickers:
-        tasks.append(asyncio.create_task(_worker(ticker)))
+        tasks.append(asyncio.create_task(_worker(ticker, _providers_for(ticker))))
 
     if tasks:
         await asyncio.gather(*tasks)
@@ -491,14 +569,34 @@ def _env_provider_list(*env_names: str) -> list[str]:
     return [p for p in providers if p]
 
 
-@lru_cache(maxsize=1)
 def _provider_registry() -> Dict[str, CandleProvider]:
-    """缓存默认提供方实例，避免重复初始化。"""
-    providers = list(default_providers())
-    registry: Dict[str, CandleProvider] = {}
-    for provider in providers:
-        registry[provider.name] = provider
-    return registry
+    """按名称索引默认提供方；实例本身由 default_providers 缓存，避免重复初始化。"""
+    return {provider.name: provider for provider in default_providers()}
+
+
+_MARKET_PROVIDER_ENV: Dict[str, tuple[str, ...]] = {
+    "cn": ("A_STOCK_PRIMARY", "A_STOCK_SECONDARY"),
+    "hk": ("HK_STOCK_PRIMARY", "HK_STOCK_SECONDARY"),
+    "us": ("US_STOCK_PRIMARY", "US_STOCK_SECONDARY"),
+}
+
+_MARKET_FALLBACK: Dict[str, list[str]] = {
+    "cn": ["tushare", "akshare", "yfinance", "akshare_us"],
+    "hk": ["yfinance", "akshare", "akshare_us", "tushare"],
+    "us": ["yfinance", "akshare_us", "akshare", "tushare"],
+    "other": ["yfinance", "akshare", "akshare_us", "tushare"],
+}
+
+
+def _classify_market(ticker: str) -> str:
+    """将代码归类为 cn / hk / us / other，用于选择数据源优先级。"""
+    if _is_china_equity(ticker):
+        return "cn"
+    if ticker.upper().endswith(".HK"):
+        return "hk"
+    if _is_us_equity(ticker):
+        return "us"
+    return "other"
 
 
 def _resolve_providers(
@@ -507,6 +605,16 @@ def _resolve_providers(
     requested: Optional[Sequence[str]],
 ) -> Sequence[CandleProvider]:
     """按优先级返回可用的数据源实例列表。"""
+    market = None if requested else _classify_market(ticker)
+    return _resolve_market_providers(market, interval, requested)
+
+
+def _resolve_market_providers(
+    market: Optional[str],
+    interval: str,
+    requested: Optional[Sequence[str]],
+) -> Sequence[CandleProvider]:
+    """按市场类型（或显式指定的数据源）返回数据源实例列表。"""
     registry = _provider_registry()
     ordered: list[CandleProvider] = []
 
@@ -522,22 +630,10 @@ def _resolve_providers(
                 continue
             _maybe_add(provider)
     else:
-        ticker_upper = ticker.upper()
-        if _is_china_equity(ticker):
-            preferred = _env_provider_list("A_STOCK_PRIMARY", "A_STOCK_SECONDARY")
-            fallback = ["tushare", "akshare", "yfinance", "akshare_us"]
-        elif ticker_upper.endswith(".HK"):
-            preferred = _env_provider_list("HK_STOCK_PRIMARY", "HK_STOCK_SECONDARY")
-            fallback = ["yfinance", "akshare", "akshare_us", "tushare"]
-        elif _is_us_equity(ticker):
-            preferred = _env_provider_list("US_STOCK_PRIMARY", "US_STOCK_SECONDARY")
-            fallback = ["yfinance", "akshare_us", "akshare", "tushare"]
-        else:
-            preferred = []
-            fallback = ["yfinance", "akshare", "akshare_us", "tushare"]
-
+        market = market or "other"
+        preferred = _env_provider_list(*_MARKET_PROVIDER_ENV.get(market, ()))
         if not preferred:
-            preferred = fallback
+            preferred = _MARKET_FALLBACK[market]
 
         for name in preferred:
             provider = registry.get(name)
@@ -2,13 +2,31 @@
 
 from __future__ import annotations
 
+import logging
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Mapping
 
 import numpy as np
 import pandas as pd
 
+from ._njit import NUMBA_AVAILABLE, njit
+
+try:  # pragma: no cover - 可选依赖
+    import bottleneck as bn  # type: ignore
+except ImportError:  # pragma: no cover
+    bn = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# 未安装 numba 时滑动窗口内核会退化为纯 Python 循环，此时优先使用 bottleneck 的 C 实现
+_USE_BOTTLENECK = bn is not None and not NUMBA_AVAILABLE
+
 
 @dataclass(frozen=True)
 class IndicatorSnapshot:
@@ -16,85 +34,495 @@ class IndicatorSnapshot:
     features: Dict[str, Any]
 
 
-def compute_all(df: pd.DataFrame) -> Dict[str, Any]:
+# 各指标计算所需的尾部样本数。递推类指标（EMA/RSI/KDJ）取约 10 倍时间常数，
+# 截断带来的初值误差衰减到 1e-8 量级；滚动窗口类只需覆盖窗口长度。
+_WARMUP = {
+    "ema20": 200,
+    "ema50": 500,
+    "ema200": 2000,
+    "macd": 400,
+    "rsi": 400,
+    "atr": 14,
+    "adx": 60,
+    "kdj": 120,
+    "bb": 20,
+}
+
+
+class _ScratchPool(threading.local):
+    """线程内复用的 float64 缓冲区，避免每次 ``compute_all`` 都重新申请数组。
+
+    返回的缓冲区会被同一线程的下一次调用覆盖，只能用于当次计算的中间结果。
+    """
+
+    def __init__(self) -> None:
+        self._buf: np.ndarray | None = None
+
+    def get(self, n: int, k: int) -> np.ndarray:
+        buf = self._buf
+        if buf is None or buf.shape[0] < k or buf.shape[1] < n:
+            rows = k if buf is None else max(k, buf.shape[0])
+            cols = n if buf is None else max(n, buf.shape[1])
+            buf = self._buf = np.empty((rows, cols), dtype=np.float64)
+        return buf
+
+
+_SCRATCH = _ScratchPool()
+
+
+class _FeatureCache:
+    """按 DataFrame 对象缓存 ``compute_all`` 的结果。
+
+    只持有弱引用，对象被回收后条目随之失效；键中包含行数与最近 ``_KEY_TAIL`` 根
+    K 线（含时间索引）的哈希，追加 K 线或原地修订近期 K 线（如回补收盘价）时
+    不会命中旧结果。更早的 K 线视为不再变动：若需原地改写更早的历史，应传入新的
+    DataFrame 对象。
+    """
+
+    _KEY_TAIL = 64
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[int, tuple[weakref.ref, Any, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def key(cls, df: pd.DataFrame, fields: tuple[str, ...] | None) -> Any:
+        tail = df.iloc[-cls._KEY_TAIL :]
+        values = tail.to_numpy()
+        if values.dtype == object:
+            digest = pd.util.hash_pandas_object(tail, index=True).to_numpy().tobytes()
+        else:
+            digest = values.tobytes() + tail.index.to_numpy().tobytes()
+        return (fields, len(df), digest)
+
+    def get(self, df: pd.DataFrame, key: Any) -> Dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(id(df))
+            if entry is None or entry[0]() is not df or entry[1] != key:
+                return None
+            self._entries.move_to_end(id(df))
+            return dict(entry[2])
+
+    def put(self, df: pd.DataFrame, key: Any, features: Dict[str, Any]) -> None:
+        try:
+            ref = weakref.ref(df)
+        except TypeError:  # pragma: no cover - 不支持弱引用的对象不缓存
+            return
+        with self._lock:
+            self._entries[id(df)] = (ref, key, features)
+            self._entries.move_to_end(id(df))
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+
+_FEATURE_CACHE = _FeatureCache()
+
+# 输出字段 -> 需要计算的指标组；未列出的字段（价格、成交量统计等）无需额外计算
+_FIELD_GROUPS: Dict[str, frozenset[str]] = {
+    **dict.fromkeys(("ema20", "ema50", "ema200", "ema_trend_up", "ema_trend_down"), frozenset({"ema"})),
+    **dict.fromkeys(("atr", "atr_percent"), frozenset({"atr"})),
+    "adx": frozenset({"adx"}),
+    **dict.fromkeys(("macd_line", "macd_signal", "macd_hist", "macd_cross"), frozenset({"macd"})),
+    "rsi": frozenset({"rsi"}),
+    "rsi_zscore": frozenset({"rsi", "rsi_zscore"}),
+    "stoch_rsi": frozenset({"rsi", "stoch_rsi"}),
+    **dict.fromkeys(("kdj_k", "kdj_d", "kdj_j"), frozenset({"kdj"})),
+    **dict.fromkeys(("bb_middle", "bb_upper", "bb_lower", "bb_position"), frozenset({"bb"})),
+    "anchored_vwap": frozenset({"vwap"}),
+}
+_ALL_GROUPS = frozenset().union(*_FIELD_GROUPS.values())
+_BASE_FIELDS = frozenset(
+    {
+        "price",
+        "open",
+        "high",
+        "low",
+        "volume",
+        "recent_high",
+        "recent_low",
+        "timestamp",
+        "volume_avg_5d",
+        "volume_avg_20d",
+        "volume_score",
+    }
+)
+_INDICATOR_KEYS = (
+    "ema20",
+    "ema50",
+    "ema200",
+    "atr",
+    "adx",
+    "macd_line",
+    "macd_signal",
+    "macd_hist",
+    "rsi",
+    "rsi_zscore",
+    "stoch_rsi",
+    "kdj_k",
+    "kdj_d",
+    "kdj_j",
+    "bb_middle",
+    "bb_upper",
+    "bb_lower",
+    "bb_position",
+    "anchored_vwap",
+)
+
+
+def _resolve_groups(fields: Iterable[str]) -> frozenset[str]:
+    groups: set[str] = set()
+    for field in fields:
+        if field in _FIELD_GROUPS:
+            groups |= _FIELD_GROUPS[field]
+        elif field not in _BASE_FIELDS:
+            raise ValueError(f"Unknown indicator field: {field}")
+    return frozenset(groups)
+
+
+def compute_all(df: pd.DataFrame, fields: Iterable[str] | None = None) -> Dict[str, Any]:
+    """计算全部技术指标；传入 ``fields`` 时只计算并返回所需字段。
+
+    同一个 DataFrame 对象在一次决策流程中常被重复传入，结果按对象缓存，
+    追加新行或改写最后一根 K 线都会使缓存失效。
+    """
     if df.empty:
         raise ValueError("No data available for indicator computation.")
+    if fields is not None:
+        fields = tuple(fields)
+    key = _FEATURE_CACHE.key(df, fields)
+    cached = _FEATURE_CACHE.get(df, key)
+    if cached is not None:
+        return cached
+    features = _compute_features(df, fields)
+    _FEATURE_CACHE.put(df, key, features)
+    return dict(features)
+
+
+def _compute_features(df: pd.DataFrame, fields: tuple[str, ...] | None) -> Dict[str, Any]:
+    groups = _ALL_GROUPS if fields is None else _resolve_groups(fields)
+
+    data = _flatten_columns(df)
+    open_, high, low, close, volume = _ohlcv_arrays(data)
+
+    # 只消费最后一个值，因此每个指标只在足够收敛的尾部窗口上计算；
+    # 未请求的指标保持 NaN，最后按 fields 过滤掉
+    latest: Dict[str, float] = dict.fromkeys(_INDICATOR_KEYS, np.nan)
+    macd_cross = None
+    # EMA/MACD 的结果只在本函数内读取末值，借用线程内复用的缓冲区
+    scratch = _SCRATCH.get(min(close.shape[0], _WARMUP["ema200"]), 6)
+
+    if "ema" in groups:
+        for row, span in enumerate((20, 50, 200)):
+            tail = close[-_WARMUP[f"ema{span}"]:]
+            latest[f"ema{span}"] = _ema(tail, span, scratch[row, : tail.shape[0]])[-1]
+
+    if groups & {"atr", "adx"}:
+        # ATR 与 ADX 共用同一份真实波幅
+        tr = _true_range(high[-_WARMUP["adx"]:], low[-_WARMUP["adx"]:], close[-_WARMUP["adx"]:])
+        latest["atr"] = _atr(tr[-_WARMUP["atr"]:], period=14)[-1]
+        if "adx" in groups:
+            latest["adx"] = _adx(high[-_WARMUP["adx"]:], low[-_WARMUP["adx"]:], tr, period=14)[-1]
 
-    data = df.copy()
-    if isinstance(data.columns, pd.MultiIndex):
-        data.columns = data.columns.get_level_values(0)
+    if "macd" in groups:
+        macd_close = close[-_WARMUP["macd"]:]
+        macd_line, macd_signal = _macd(macd_close, out=scratch[3:6, : macd_close.shape[0]])
+        macd_cross = _macd_cross(macd_line, macd_signal)
+        latest["macd_line"] = macd_line[-1]
+        latest["macd_signal"] = macd_signal[-1]
+        latest["macd_hist"] = macd_line[-1] - macd_signal[-1]
 
-    close = data["Close"]
-    high = data["High"]
-    low = data["Low"]
-    volume = data.get("Volume", pd.Series(np.nan, index=data.index))
+    if "rsi" in groups:
+        rsi = _rsi(close[-_WARMUP["rsi"]:], period=14)
+        latest["rsi"] = rsi[-1]
+        if "rsi_zscore" in groups:
+            latest["rsi_zscore"] = _zscore(rsi, window=100)[-1]
+        if "stoch_rsi" in groups:
+            latest["stoch_rsi"] = _stoch_rsi(rsi, period=14)[-1]
 
-    ema20 = _ema(close, 20)
-    ema50 = _ema(close, 50)
-    ema200 = _ema(close, 200)
+    if "kdj" in groups:
+        kdj_window = slice(-_WARMUP["kdj"], None)
+        k_value, d_value, j_value = _kdj(high[kdj_window], low[kdj_window], close[kdj_window])
+        latest["kdj_k"], latest["kdj_d"], latest["kdj_j"] = k_value[-1], d_value[-1], j_value[-1]
 
-    atr = _atr(high, low, close, period=14)
-    adx = _adx(high, low, close, period=14)
+    if "bb" in groups:
+        bb_mavg, bb_upper, bb_lower, bb_pos = _bollinger(close[-_WARMUP["bb"]:], period=20)
+        latest["bb_middle"], latest["bb_upper"] = bb_mavg[-1], bb_upper[-1]
+        latest["bb_lower"], latest["bb_position"] = bb_lower[-1], bb_pos[-1]
 
-    macd_line, macd_signal = _macd(close)
-    macd_hist = macd_line - macd_signal
-    macd_cross = _macd_cross(macd_line, macd_signal)
+    if "vwap" in groups:
+        latest["anchored_vwap"] = _anchored_vwap(data.index, close, volume)
 
-    rsi = _rsi(close, period=14)
-    rsi_zscore = _zscore(rsi, window=100)
+    features = _assemble_features(data.index[-1], open_, high, low, close, volume, latest, macd_cross)
+    if fields is None:
+        return features
+    return {key: features[key] for key in fields}
 
-    stoch_rsi = _stoch_rsi(rsi, period=14)
 
-    k_value, d_value, j_value = _kdj(high, low, close)
+def compute_all_batch(frames: Mapping[str, pd.DataFrame], max_workers: int | None = None) -> Dict[str, Dict[str, Any]]:
+    """批量计算多只股票的指标，返回 ``{代码: features}``。
 
-    bb_mavg, bb_upper, bb_lower, bb_pos = _bollinger(close, period=20)
+    各代码在线程池中并行计算；数值内核以 ``nogil`` 编译，可真正跨核执行。
+    空数据或计算失败的代码不会出现在结果中，由调用方按缺失处理。
+    """
+    items = [(symbol, df) for symbol, df in frames.items() if df is not None and not df.empty]
+    if not items:
+        return {}
 
-    anchored_vwap = _anchored_vwap(close, volume)
+    def _run(item: tuple[str, pd.DataFrame]) -> tuple[str, Dict[str, Any] | None]:
+        symbol, df = item
+        try:
+            return symbol, compute_all(df)
+        except Exception as exc:  # pragma: no cover - 单只股票失败不影响整体
+            logger.warning("Indicator computation failed for %s: %s", symbol, exc)
+            return symbol, None
 
-    latest_idx = close.index[-1]
+    workers = max_workers or min(len(items), os.cpu_count() or 1)
+    if workers <= 1:
+        results = map(_run, items)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="indicators") as pool:
+            results = list(pool.map(_run, items))
+    return {symbol: features for symbol, features in results if features is not None}
+
+
+class IndicatorState:
+    """``compute_all`` 的流式版本，供逐根 K 线追加的实时场景使用。
+
+    递推类指标（EMA/MACD/RSI/KDJ）只保存上一步状态，每根新 K 线 O(1) 推进；
+    滚动窗口类指标（ATR/ADX/布林带/StochRSI/Z-Score）只保留固定长度的尾部缓冲，
+    单次更新的开销与历史长度无关。结果与对完整序列调用 ``compute_all`` 一致
+    （递推初值截断误差在 1e-8 量级）。
+    """
+
+    # 尾部 OHLCV 缓冲长度，需覆盖 ADX 所需窗口
+    _BAR_TAIL = _WARMUP["adx"]
+    # RSI 历史长度，需覆盖 Z-Score 窗口
+    _RSI_TAIL = 100
+
+    def __init__(self) -> None:
+        self._bars = np.full((0, 5), np.nan)
+        self._rsi = np.full(0, np.nan)
+        self._ewm: Dict[str, _EwmState] = {
+            "ema20": _EwmState(2.0 / 21),
+            "ema50": _EwmState(2.0 / 51),
+            "ema200": _EwmState(2.0 / 201),
+            "ema12": _EwmState(2.0 / 13),
+            "ema26": _EwmState(2.0 / 27),
+            "macd_signal": _EwmState(2.0 / 10),
+            "avg_gain": _EwmState(1.0 / 14, min_periods=14),
+            "avg_loss": _EwmState(1.0 / 14, min_periods=14),
+            "kdj_k": _EwmState(1.0 / 3),
+            "kdj_d": _EwmState(1.0 / 3),
+        }
+        self._prev_macd_diff = np.nan
+        self._vwap_month: Any = None
+        self._vwap_pv = 0.0
+        self._vwap_vol = 0.0
+        self._has_volume = False
+        self.features: Dict[str, Any] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "IndicatorState":
+        """冷启动：按 ``compute_all`` 的尾部窗口批量建立状态。"""
+        if df.empty:
+            raise ValueError("No data available for indicator computation.")
+        data = _flatten_columns(df)
+        open_, high, low, close, volume = _ohlcv_arrays(data)
+
+        state = cls()
+        ewm = state._ewm
+        for span in (20, 50, 200):
+            ewm[f"ema{span}"].run(close[-_WARMUP[f"ema{span}"]:])
+        macd_close = close[-_WARMUP["macd"]:]
+        ema12 = ewm["ema12"].run(macd_close)
+        ema26 = ewm["ema26"].run(macd_close)
+        macd_line = ema12 - ema26
+        macd_signal = ewm["macd_signal"].run(macd_line)
+        state._prev_macd_diff = macd_line[-1] - macd_signal[-1]
+
+        delta = _diff(close[-_WARMUP["rsi"]:])
+        avg_gain = ewm["avg_gain"].run(np.clip(delta, 0, None))
+        avg_loss = ewm["avg_loss"].run(-np.clip(delta, None, 0))
+        state._rsi = _bfill(_rsi_from_averages(avg_gain, avg_loss))[-cls._RSI_TAIL:]
+
+        kdj_window = slice(-_WARMUP["kdj"], None)
+        rsv = _rsv(high[kdj_window], low[kdj_window], close[kdj_window])
+        ewm["kdj_d"].run(ewm["kdj_k"].run(rsv))
+
+        month_start = _month_start(data.index[-1])
+        mask = data.index >= month_start
+        state._vwap_month = month_start
+        state._vwap_pv = float(np.nansum(close[mask] * volume[mask]))
+        state._vwap_vol = float(np.nansum(volume[mask]))
+        state._has_volume = not np.isnan(volume).all()
+
+        state._bars = np.column_stack(
+            (open_[-cls._BAR_TAIL:], high[-cls._BAR_TAIL:], low[-cls._BAR_TAIL:], close[-cls._BAR_TAIL:], volume[-cls._BAR_TAIL:])
+        )
+        state.features = compute_all(df)
+        return state
+
+    def update(self, new_bar: pd.Series) -> Dict[str, Any]:
+        """追加一根新 K 线（``name`` 为时间戳）并返回最新指标。"""
+        volume = float(new_bar.get("Volume", np.nan))
+        row = np.array(
+            [float(new_bar["Open"]), float(new_bar["High"]), float(new_bar["Low"]), float(new_bar["Close"]), volume]
+        )
+        self._bars = np.vstack((self._bars, row))[-self._BAR_TAIL:]
+        open_, high, low, close, vol = (np.ascontiguousarray(self._bars[:, col]) for col in range(5))
+        price = close[-1]
+        prev_close = close[-2] if close.size >= 2 else np.nan
+        ewm = self._ewm
+
+        ema20 = ewm["ema20"].step(price)
+        ema50 = ewm["ema50"].step(price)
+        ema200 = ewm["ema200"].step(price)
+
+        macd_line = ewm["ema12"].step(price) - ewm["ema26"].step(price)
+        macd_signal = ewm["macd_signal"].step(macd_line)
+        macd_cross = _cross_direction(self._prev_macd_diff, macd_line - macd_signal)
+        self._prev_macd_diff = macd_line - macd_signal
+
+        delta = price - prev_close
+        avg_gain = ewm["avg_gain"].step(float(np.clip(delta, 0, None)))
+        avg_loss = ewm["avg_loss"].step(float(-np.clip(delta, None, 0)))
+        rsi = _rsi_from_averages(np.array([avg_gain]), np.array([avg_loss]))
+        rsi_hist = np.concatenate((self._rsi, rsi))
+        if not np.isnan(rsi[0]) and np.isnan(rsi_hist[0]):
+            rsi_hist = _bfill(rsi_hist)
+        self._rsi = rsi_hist[-self._RSI_TAIL:]
+
+        tr = _true_range(high, low, close)
+        atr = _atr(tr[-_WARMUP["atr"]:], period=14)
+        adx = _adx(high, low, tr, period=14)
+        rsi_zscore = _zscore(self._rsi, window=100)
+        stoch_rsi = _stoch_rsi(self._rsi, period=14)
+
+        rsv = _rsv(high[-9:], low[-9:], close[-9:])[-1]
+        k_value = ewm["kdj_k"].step(rsv)
+        d_value = ewm["kdj_d"].step(k_value)
+        j_value = 3 * k_value - 2 * d_value
+        bb_mavg, bb_upper, bb_lower, bb_pos = _bollinger(close[-_WARMUP["bb"]:], period=20)
+
+        month_start = _month_start(new_bar.name)
+        if month_start != self._vwap_month:
+            self._vwap_month = month_start
+            self._vwap_pv = 0.0
+            self._vwap_vol = 0.0
+        if volume == volume:
+            self._has_volume = True
+            if price == price:
+                self._vwap_pv += price * volume
+            self._vwap_vol += volume
+        if not self._has_volume:
+            anchored_vwap = price
+        elif np.isnan(price * volume) or self._vwap_vol == 0:
+            anchored_vwap = np.nan
+        else:
+            anchored_vwap = self._vwap_pv / self._vwap_vol
+
+        latest = {
+            "ema20": ema20,
+            "ema50": ema50,
+            "ema200": ema200,
+            "atr": atr[-1],
+            "adx": adx[-1],
+            "macd_line": macd_line,
+            "macd_signal": macd_signal,
+            "macd_hist": macd_line - macd_signal,
+            "rsi": self._rsi[-1],
+            "rsi_zscore": rsi_zscore[-1],
+            "stoch_rsi": stoch_rsi[-1],
+            "kdj_k": _nan_to(k_value, 50.0),
+            "kdj_d": _nan_to(d_value, 50.0),
+            "kdj_j": _nan_to(j_value, 50.0),
+            "bb_middle": bb_mavg[-1],
+            "bb_upper": bb_upper[-1],
+            "bb_lower": bb_lower[-1],
+            "bb_position": bb_pos[-1],
+            "anchored_vwap": anchored_vwap,
+        }
+        self.features = _assemble_features(new_bar.name, open_, high, low, close, vol, latest, macd_cross)
+        return self.features
+
+
+def update_all(state: IndicatorState, new_bar: pd.Series) -> Dict[str, Any]:
+    """以增量方式推进 ``state`` 并返回最新指标，等价于对追加后的数据调用 ``compute_all``。"""
+    return state.update(new_bar)
+
+
+def warmup_kernels() -> None:
+    """预先触发 numba 内核的编译或磁盘缓存加载，避免首个请求承担 JIT 延迟。
+
+    内核均以 ``cache=True`` 编译，进程重启后只需从 ``__pycache__`` 读取机器码；
+    未安装 numba 时本函数只是一次很小的纯 Python 计算。
+    """
+    periods = 40
+    base = np.linspace(100.0, 104.0, periods)
+    frame = pd.DataFrame(
+        {"Open": base, "High": base + 1, "Low": base - 1, "Close": base, "Volume": np.full(periods, 1e6)},
+        index=pd.date_range("2024-01-01", periods=periods, freq="D", tz="UTC"),
+    )
+    state = IndicatorState.from_frame(frame.iloc[:-1])
+    state.update(frame.iloc[-1])
+
+
+def _assemble_features(
+    latest_idx: Any,
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    latest: Dict[str, float],
+    macd_cross: str | None,
+) -> Dict[str, Any]:
     timestamp = latest_idx if isinstance(latest_idx, datetime) else datetime.now(timezone.utc)
 
-    volume_avg_5d = float(volume.tail(5).mean()) if not volume.tail(5).isna().all() else None
-    volume_avg_20d = float(volume.tail(20).mean()) if not volume.tail(20).isna().all() else None
+    volume_avg_5d = _nanmean_or_none(volume[-5:])
+    volume_avg_20d = _nanmean_or_none(volume[-20:])
     volume_score = None
-    if volume_avg_20d and not np.isnan(volume.iloc[-1]):
-        volume_score = float(volume.iloc[-1] / volume_avg_20d) if volume_avg_20d else None
+    if volume_avg_20d and not np.isnan(volume[-1]):
+        volume_score = float(volume[-1] / volume_avg_20d) if volume_avg_20d else None
 
-    atr_value = float(atr.iloc[-1])
+    atr_value = float(latest["atr"])
     atr_percent = None
-    if close.iloc[-1]:
-        atr_percent = float(atr_value / close.iloc[-1])
+    if close[-1]:
+        atr_percent = float(atr_value / close[-1])
 
+    ema20, ema50, ema200 = latest["ema20"], latest["ema50"], latest["ema200"]
+    recent_low, recent_high = _nan_min_max(close[-20:])
     features: Dict[str, Any] = {
-        "price": float(close.iloc[-1]),
-        "open": float(data["Open"].iloc[-1]),
-        "high": float(high.iloc[-1]),
-        "low": float(low.iloc[-1]),
-        "volume": float(volume.iloc[-1]) if not np.isnan(volume.iloc[-1]) else None,
-        "ema20": float(ema20.iloc[-1]),
-        "ema50": float(ema50.iloc[-1]),
-        "ema200": float(ema200.iloc[-1]),
-        "ema_trend_up": bool(ema20.iloc[-1] > ema50.iloc[-1] > ema200.iloc[-1]),
-        "ema_trend_down": bool(ema20.iloc[-1] < ema50.iloc[-1] < ema200.iloc[-1]),
-        "atr": float(atr.iloc[-1]),
-        "adx": float(adx.iloc[-1]),
-        "macd_line": float(macd_line.iloc[-1]),
-        "macd_signal": float(macd_signal.iloc[-1]),
-        "macd_hist": float(macd_hist.iloc[-1]),
+        "price": float(close[-1]),
+        "open": float(open_[-1]),
+        "high": float(high[-1]),
+        "low": float(low[-1]),
+        "volume": float(volume[-1]) if not np.isnan(volume[-1]) else None,
+        "ema20": float(ema20),
+        "ema50": float(ema50),
+        "ema200": float(ema200),
+        "ema_trend_up": bool(ema20 > ema50 > ema200),
+        "ema_trend_down": bool(ema20 < ema50 < ema200),
+        "atr": atr_value,
+        "adx": float(latest["adx"]),
+        "macd_line": float(latest["macd_line"]),
+        "macd_signal": float(latest["macd_signal"]),
+        "macd_hist": float(latest["macd_hist"]),
         "macd_cross": macd_cross,
-        "rsi": float(rsi.iloc[-1]),
-        "rsi_zscore": float(rsi_zscore.iloc[-1]),
-        "stoch_rsi": float(stoch_rsi.iloc[-1]),
-        "kdj_k": float(k_value.iloc[-1]),
-        "kdj_d": float(d_value.iloc[-1]),
-        "kdj_j": float(j_value.iloc[-1]),
-        "bb_middle": float(bb_mavg.iloc[-1]),
-        "bb_upper": float(bb_upper.iloc[-1]),
-        "bb_lower": float(bb_lower.iloc[-1]),
-        "bb_position": float(bb_pos.iloc[-1]),
-        "anchored_vwap": float(anchored_vwap),
-        "recent_high": float(close.tail(20).max()),
-        "recent_low": float(close.tail(20).min()),
+        "rsi": float(latest["rsi"]),
+        "rsi_zscore": float(latest["rsi_zscore"]),
+        "stoch_rsi": float(latest["stoch_rsi"]),
+        "kdj_k": float(latest["kdj_k"]),
+        "kdj_d": float(latest["kdj_d"]),
+        "kdj_j": float(latest["kdj_j"]),
+        "bb_middle": float(latest["bb_middle"]),
+        "bb_upper": float(latest["bb_upper"]),
+        "bb_lower": float(latest["bb_lower"]),
+        "bb_position": float(latest["bb_position"]),
+        "anchored_vwap": float(latest["anchored_vwap"]),
+        "recent_high": float(recent_high),
+        "recent_low": float(recent_low),
         "timestamp": timestamp.astimezone(timezone.utc).isoformat(),
         "atr_percent": atr_percent,
         "volume_avg_5d": volume_avg_5d,
@@ -104,59 +532,517 @@ def compute_all(df: pd.DataFrame) -> Dict[str, Any]:
     return features
 
 
-def _ema(series: pd.Series, span: int) -> pd.Series:
-    return series.ewm(span=span, adjust=False).mean()
+def _flatten_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """多级列（如 yfinance 的 Price/Ticker）只保留第一级；只读，不复制数据。"""
+    if isinstance(df.columns, pd.MultiIndex):
+        return df.droplevel(list(range(1, df.columns.nlevels)), axis=1)
+    return df
+
+
+def _ohlcv_arrays(data: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """只读取一次底层数组，后续指标全部在 ndarray 上计算。"""
+    close = np.ascontiguousarray(data["Close"].to_numpy(dtype=np.float64))
+    high = np.ascontiguousarray(data["High"].to_numpy(dtype=np.float64))
+    low = np.ascontiguousarray(data["Low"].to_numpy(dtype=np.float64))
+    open_ = np.ascontiguousarray(data["Open"].to_numpy(dtype=np.float64))
+    if "Volume" in data.columns:
+        volume = np.ascontiguousarray(data["Volume"].to_numpy(dtype=np.float64))
+    else:
+        volume = np.full(close.shape, np.nan)
+    return open_, high, low, close, volume
+
+
+def _nan_to(value: float, fill: float) -> float:
+    return fill if value != value else value
+
+
+@njit(cache=True)
+def _nan_min_max(values: np.ndarray) -> tuple[float, float]:
+    """一次遍历求忽略空值的最小/最大值，全为空时返回 (NaN, NaN)。"""
+    low = np.nan
+    high = np.nan
+    for value in values:
+        if value != value:
+            continue
+        if not low <= value:
+            low = value
+        if not high >= value:
+            high = value
+    return low, high
+
+
+def _nanmean_or_none(values: np.ndarray) -> float | None:
+    if np.isnan(values).all():
+        return None
+    return float(np.nanmean(values))
+
+
+def _shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    shifted = np.empty_like(values)
+    shifted[:periods] = np.nan
+    shifted[periods:] = values[:-periods]
+    return shifted
+
+
+def _diff(values: np.ndarray) -> np.ndarray:
+    return values - _shift(values)
+
+
+def _fillna(values: np.ndarray, fill: float) -> np.ndarray:
+    """原地填充空值，调用方须保证 ``values`` 为可改写的中间结果。"""
+    np.copyto(values, fill, where=np.isnan(values))
+    return values
+
+
+def _masked_divide(num: np.ndarray, den: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """分母为 0 处结果记为 NaN，等价于 pandas 的 ``num / den.replace(0, np.nan)``，且不改写分母。"""
+    zero = den == 0
+    out = np.divide(num, den, out=out, where=~zero)
+    out[zero] = np.nan
+    return out
+
+
+def _bfill(values: np.ndarray) -> np.ndarray:
+    valid = np.flatnonzero(~np.isnan(values))
+    if valid.size == 0 or valid[0] == 0:
+        return values
+    filled = values.copy()
+    filled[: valid[0]] = values[valid[0]]
+    return filled
+
+
+@njit(cache=True, nogil=True)
+def _roll_sum(values: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """滑动求和，窗口滑动时增量加减（Kahan 补偿），语义同 pandas rolling().sum()。"""
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    total = 0.0
+    comp = 0.0
+    nobs = 0
+    same_run = 0
+    prev = np.nan
+    for i in range(n):
+        if i >= window:
+            old = values[i - window]
+            if old == old:
+                nobs -= 1
+                y = -old - comp
+                t = total + y
+                comp = t - total - y
+                total = t
+        val = values[i]
+        if val == val:
+            nobs += 1
+            y = val - comp
+            t = total + y
+            comp = t - total - y
+            total = t
+            if val == prev:
+                same_run += 1
+            else:
+                same_run = 1
+            prev = val
+        if nobs >= min_periods and nobs > 0:
+            # 窗口内全部为同一值时直接给出精确结果，避免残留的舍入误差
+            out[i] = prev * nobs if same_run >= nobs else total
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _roll_mean_kernel(values: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    sums = _roll_sum(values, window, 1)
+    out = np.empty(values.shape[0], dtype=np.float64)
+    nobs = 0
+    same_run = 0
+    prev = np.nan
+    for i in range(values.shape[0]):
+        if i >= window and values[i - window] == values[i - window]:
+            nobs -= 1
+        val = values[i]
+        if val == val:
+            nobs += 1
+            if val == prev:
+                same_run += 1
+            else:
+                same_run = 1
+            prev = val
+        if nobs >= min_periods and nobs > 0:
+            out[i] = prev if same_run >= nobs else sums[i] / nobs
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _roll_mean_std_kernel(values: np.ndarray, window: int, min_periods: int) -> tuple[np.ndarray, np.ndarray]:
+    """一次遍历同时给出滑动均值与总体标准差（ddof=0）。
+
+    Welford 增量更新均值与离差平方和，避免 sum/sum-of-squares 相减造成的精度损失。
+    """
+    n = values.shape[0]
+    mean_out = np.empty(n, dtype=np.float64)
+    out = np.empty(n, dtype=np.float64)
+    mean = 0.0
+    ssqdm = 0.0
+    comp = 0.0
+    nobs = 0
+    same_run = 0
+    prev = np.nan
+    for i in range(n):
+        if i >= window:
+            old = values[i - window]
+            if old == old:
+                nobs -= 1
+                if nobs > 0:
+                    delta = old - mean
+                    y = -delta / nobs - comp
+                    t = mean + y
+                    comp = t - mean - y
+                    mean = t
+                    ssqdm -= (nobs + 1) * delta * delta / nobs
+                else:
+                    mean = 0.0
+                    ssqdm = 0.0
+                    comp = 0.0
+        val = values[i]
+        if val == val:
+            nobs += 1
+            if val == prev:
+                same_run += 1
+            else:
+                same_run = 1
+            prev = val
+            delta = val - mean
+            y = delta / nobs - comp
+            t = mean + y
+            comp = t - mean - y
+            mean = t
+            ssqdm += (nobs - 1) * delta * delta / nobs
+        if nobs >= min_periods and nobs > 0:
+            if same_run >= nobs:
+                mean_out[i] = prev
+                out[i] = 0.0
+            else:
+                mean_out[i] = mean
+                out[i] = np.sqrt(ssqdm / nobs) if nobs > 1 and ssqdm > 0.0 else 0.0
+        else:
+            mean_out[i] = np.nan
+            out[i] = np.nan
+    return mean_out, out
+
+
+@njit(cache=True, nogil=True)
+def _roll_extreme(values: np.ndarray, window: int, min_periods: int, is_max: bool) -> np.ndarray:
+    """单调队列求滑动最值，每步均摊 O(1)；空值不入队。"""
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    # 环形缓冲区存放下标，容量为窗口长度即可
+    ring = np.empty(window, dtype=np.int64)
+    head = 0
+    size = 0
+    nobs = 0
+    for i in range(n):
+        if i >= window and values[i - window] == values[i - window]:
+            nobs -= 1
+        if size > 0 and ring[head] <= i - window:
+            head = (head + 1) % window
+            size -= 1
+        val = values[i]
+        if val == val:
+            nobs += 1
+            while size > 0:
+                tail = ring[(head + size - 1) % window]
+                if (values[tail] <= val) if is_max else (values[tail] >= val):
+                    size -= 1
+                else:
+                    break
+            ring[(head + size) % window] = i
+            size += 1
+        if nobs >= min_periods and nobs > 0 and size > 0:
+            out[i] = values[ring[head]]
+        else:
+            out[i] = np.nan
+    return out
+
+
+def _bn_window(values: np.ndarray, window: int, min_periods: int) -> int | None:
+    """bottleneck 要求窗口不超过序列长度；窗口更长时结果与截到序列长度相同。"""
+    n = values.shape[0]
+    if n == 0 or min_periods > n:
+        return None
+    return min(window, n)
+
+
+def _roll_mean(values: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    if not _USE_BOTTLENECK:
+        return _roll_mean_kernel(values, window, min_periods)
+    size = _bn_window(values, window, min_periods)
+    if size is None:
+        return np.full(values.shape[0], np.nan)
+    mean = bn.move_mean(values, size, min_count=max(min_periods, 1))
+    # 窗口内全部为同一值时给出精确结果，与 numba 内核一致
+    high = bn.move_max(values, size, min_count=1)
+    flat = (high == bn.move_min(values, size, min_count=1)) & ~np.isnan(mean)
+    mean[flat] = high[flat]
+    return mean
+
+
+def _roll_mean_std(values: np.ndarray, window: int, min_periods: int) -> tuple[np.ndarray, np.ndarray]:
+    if not _USE_BOTTLENECK:
+        return _roll_mean_std_kernel(values, window, min_periods)
+    size = _bn_window(values, window, min_periods)
+    if size is None:
+        empty = np.full(values.shape[0], np.nan)
+        return empty, empty.copy()
+    min_count = max(min_periods, 1)
+    mean = bn.move_mean(values, size, min_count=min_count)
+    std = bn.move_std(values, size, min_count=min_count, ddof=0)
+    high = bn.move_max(values, size, min_count=1)
+    flat = (high == bn.move_min(values, size, min_count=1)) & ~np.isnan(mean)
+    mean[flat] = high[flat]
+    std[flat] = 0.0
+    return mean, std
+
+
+def _roll_min(values: np.ndarray, window: int, min_periods: int | None = None) -> np.ndarray:
+    min_periods = window if min_periods is None else min_periods
+    if not _USE_BOTTLENECK:
+        return _roll_extreme(values, window, min_periods, False)
+    size = _bn_window(values, window, min_periods)
+    if size is None:
+        return np.full(values.shape[0], np.nan)
+    return bn.move_min(values, size, min_count=max(min_periods, 1))
+
+
+def _roll_max(values: np.ndarray, window: int, min_periods: int | None = None) -> np.ndarray:
+    min_periods = window if min_periods is None else min_periods
+    if not _USE_BOTTLENECK:
+        return _roll_extreme(values, window, min_periods, True)
+    size = _bn_window(values, window, min_periods)
+    if size is None:
+        return np.full(values.shape[0], np.nan)
+    return bn.move_max(values, size, min_count=max(min_periods, 1))
+
+
+@njit(cache=True)
+def _ewm_step(weighted: float, old_wt: float, nobs: int, cur: float, alpha: float) -> tuple[float, float, int]:
+    """EWM 单步递推，语义同 pandas ``ewm(adjust=False)``。
+
+    首个有效值作为初值；空值不更新结果，但旧权重继续衰减。
+    """
+    is_obs = cur == cur
+    if is_obs:
+        nobs += 1
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if is_obs:
+            if weighted != cur:
+                weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+            old_wt = 1.0
+    elif is_obs:
+        weighted = cur
+    return weighted, old_wt, nobs
 
 
-def _true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
-    prev_close = close.shift(1)
-    tr = pd.concat(
-        [
-            high - low,
-            (high - prev_close).abs(),
-            (low - prev_close).abs(),
-        ],
-        axis=1,
-    ).max(axis=1)
+@njit(cache=True, nogil=True)
+def _ewm_run(
+    values: np.ndarray,
+    alpha: float,
+    min_periods: int,
+    weighted: float,
+    old_wt: float,
+    nobs: int,
+    out: np.ndarray,
+) -> tuple[float, float, int]:
+    """从给定状态出发批量递推，结果写入 ``out``，返回末尾状态。"""
+    n = values.shape[0]
+    min_obs = max(min_periods, 1)
+    for i in range(n):
+        weighted, old_wt, nobs = _ewm_step(weighted, old_wt, nobs, values[i], alpha)
+        out[i] = weighted if nobs >= min_obs else np.nan
+    return weighted, old_wt, nobs
+
+
+def _ewm_mean(values: np.ndarray, alpha: float, min_periods: int = 0, out: np.ndarray | None = None) -> np.ndarray:
+    """递推 EWM，等价于 pandas ``ewm(alpha=..., adjust=False, min_periods=...).mean()``。"""
+    if out is None:
+        out = np.empty(values.shape[0], dtype=np.float64)
+    _ewm_run(values, alpha, min_periods, np.nan, 1.0, 0, out)
+    return out
+
+
+class _EwmState:
+    """单条 EWM 的递推状态，供 ``IndicatorState`` 逐步推进。"""
+
+    __slots__ = ("alpha", "min_periods", "weighted", "old_wt", "nobs")
+
+    def __init__(self, alpha: float, min_periods: int = 0) -> None:
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.weighted = np.nan
+        self.old_wt = 1.0
+        self.nobs = 0
+
+    def run(self, values: np.ndarray) -> np.ndarray:
+        out = np.empty(values.shape[0], dtype=np.float64)
+        self.weighted, self.old_wt, self.nobs = _ewm_run(
+            values, self.alpha, self.min_periods, self.weighted, self.old_wt, self.nobs, out
+        )
+        return out
+
+    def step(self, value: float) -> float:
+        self.weighted, self.old_wt, self.nobs = _ewm_step(self.weighted, self.old_wt, self.nobs, value, self.alpha)
+        return self.weighted if self.nobs >= max(self.min_periods, 1) else np.nan
+
+
+def _ema(values: np.ndarray, span: int, out: np.ndarray | None = None) -> np.ndarray:
+    return _ewm_mean(values, 2.0 / (span + 1), 0, out)
+
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """真实波幅，复用两个临时数组原地计算。
+
+    使用 ``np.fmax`` 而非 ``np.maximum``：首行 prev_close 为空时取 high - low，
+    与 pandas 行方向 ``max(skipna=True)`` 的语义一致。
+    """
+    prev_close = np.empty_like(close)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    tr = np.subtract(high, low)
+    scratch = np.subtract(high, prev_close)
+    np.abs(scratch, out=scratch)
+    np.fmax(tr, scratch, out=tr)
+    np.subtract(low, prev_close, out=scratch)
+    np.abs(scratch, out=scratch)
+    np.fmax(tr, scratch, out=tr)
     return tr
 
 
-def _atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
-    tr = _true_range(high, low, close)
-    return tr.rolling(period).mean()
+def _atr(tr: np.ndarray, period: int = 14) -> np.ndarray:
+    return _roll_mean(tr, period, period)
 
 
-def _adx(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
-    up_move = high.diff()
-    down_move = low.shift(1) - low
+def _adx(high: np.ndarray, low: np.ndarray, tr: np.ndarray, period: int = 14) -> np.ndarray:
+    # 只读取末值，而后向填充永远不会改变末值，因此不再 bfill
+    return _adx_kernel(high, low, tr, period)
 
-    plus_dm = up_move.where((up_move > down_move) & (up_move > 0), 0.0).fillna(0.0)
-    minus_dm = down_move.where((down_move > up_move) & (down_move > 0), 0.0).fillna(0.0)
 
-    tr = _true_range(high, low, close)
-    atr = tr.rolling(period).sum().replace(0, np.nan)
+@njit(cache=True)
+def _directional_move(high: np.ndarray, low: np.ndarray, i: int) -> tuple[float, float]:
+    if i == 0:
+        return 0.0, 0.0
+    up_move = high[i] - high[i - 1]
+    down_move = low[i - 1] - low[i]
+    plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+    minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+    return plus_dm, minus_dm
 
-    plus_di = 100 * (plus_dm.rolling(period).sum() / atr).fillna(0.0)
-    minus_di = 100 * (minus_dm.rolling(period).sum() / atr).fillna(0.0)
 
-    dx = (abs(plus_di - minus_di) / (plus_di + minus_di).replace(0, np.nan)) * 100
-    adx = dx.rolling(period).mean()
-    return adx.bfill()
+@njit(cache=True, nogil=True)
+def _adx_kernel(high: np.ndarray, low: np.ndarray, tr: np.ndarray, period: int) -> np.ndarray:
+    """单次遍历计算 +DM/-DM、DI、DX 与 ADX。
 
+    口径与原实现一致：DI 基于 ``period`` 窗口的滑动求和（非 Wilder 递推），
+    ADX 为 DX 的滑动均值；各滑动和均为增量加减并做 Kahan 补偿。
+    """
+    n = high.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    dx = np.empty(n, dtype=np.float64)
+    tr_sum = tr_comp = 0.0
+    plus_sum = plus_comp = 0.0
+    minus_sum = minus_comp = 0.0
+    dx_sum = dx_comp = 0.0
+    tr_obs = 0
+    dx_obs = 0
+    for i in range(n):
+        if i >= period:
+            old = tr[i - period]
+            if old == old:
+                tr_obs -= 1
+                y = -old - tr_comp
+                t = tr_sum + y
+                tr_comp = t - tr_sum - y
+                tr_sum = t
+            old_plus, old_minus = _directional_move(high, low, i - period)
+            y = -old_plus - plus_comp
+            t = plus_sum + y
+            plus_comp = t - plus_sum - y
+            plus_sum = t
+            y = -old_minus - minus_comp
+            t = minus_sum + y
+            minus_comp = t - minus_sum - y
+            minus_sum = t
+            old = dx[i - period]
+            if old == old:
+                dx_obs -= 1
+                y = -old - dx_comp
+                t = dx_sum + y
+                dx_comp = t - dx_sum - y
+                dx_sum = t
 
-def _macd(series: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple[pd.Series, pd.Series]:
-    ema_fast = _ema(series, fast)
-    ema_slow = _ema(series, slow)
-    macd_line = ema_fast - ema_slow
-    macd_signal = _ema(macd_line, signal)
+        cur = tr[i]
+        if cur == cur:
+            tr_obs += 1
+            y = cur - tr_comp
+            t = tr_sum + y
+            tr_comp = t - tr_sum - y
+            tr_sum = t
+        plus_dm, minus_dm = _directional_move(high, low, i)
+        y = plus_dm - plus_comp
+        t = plus_sum + y
+        plus_comp = t - plus_sum - y
+        plus_sum = t
+        y = minus_dm - minus_comp
+        t = minus_sum + y
+        minus_comp = t - minus_sum - y
+        minus_sum = t
+
+        # 窗口未满或 ATR 为 0 时 DI 记为 0，与 fillna(0) 的原口径一致
+        plus_di = 0.0
+        minus_di = 0.0
+        if i >= period - 1 and tr_obs >= period and tr_sum != 0:
+            plus_di = 100 * plus_sum / tr_sum
+            minus_di = 100 * minus_sum / tr_sum
+        di_sum = plus_di + minus_di
+        value = np.nan if di_sum == 0 else abs(plus_di - minus_di) / di_sum * 100
+        dx[i] = value
+        if value == value:
+            dx_obs += 1
+            y = value - dx_comp
+            t = dx_sum + y
+            dx_comp = t - dx_sum - y
+            dx_sum = t
+        out[i] = dx_sum / dx_obs if dx_obs >= period else np.nan
+    return out
+
+
+def _macd(
+    values: np.ndarray,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+    out: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """``out`` 可传入形如 (3, n) 的缓冲区，依次存放快线、慢线（随后改写为 MACD）与信号线。"""
+    if out is None:
+        out = np.empty((3, values.shape[0]), dtype=np.float64)
+    ema_fast = _ema(values, fast, out[0])
+    ema_slow = _ema(values, slow, out[1])
+    macd_line = np.subtract(ema_fast, ema_slow, out=ema_slow)
+    macd_signal = _ema(macd_line, signal, out[2])
     return macd_line, macd_signal
 
 
-def _macd_cross(macd_line: pd.Series, macd_signal: pd.Series) -> str | None:
-    if len(macd_line) < 2:
+def _macd_cross(macd_line: np.ndarray, macd_signal: np.ndarray) -> str | None:
+    """只读取两条数组的末两位判断金叉/死叉。"""
+    if macd_line.shape[0] < 2:
         return None
-    prev_diff = macd_line.iloc[-2] - macd_signal.iloc[-2]
-    curr_diff = macd_line.iloc[-1] - macd_signal.iloc[-1]
+    return _cross_direction(macd_line[-2] - macd_signal[-2], macd_line[-1] - macd_signal[-1])
+
+
+def _cross_direction(prev_diff: float, curr_diff: float) -> str | None:
     if prev_diff <= 0 < curr_diff:
         return "bullish"
     if prev_diff >= 0 > curr_diff:
@@ -164,60 +1050,141 @@ def _macd_cross(macd_line: pd.Series, macd_signal: pd.Series) -> str | None:
     return None
 
 
-def _rsi(series: pd.Series, period: int = 14) -> pd.Series:
-    delta = series.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    avg_gain = gain.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
-    avg_loss = loss.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
-    rs = avg_gain / avg_loss.replace(0, np.nan)
-    rsi = 100 - (100 / (1 + rs))
-    return rsi.bfill()
+def _rsi(values: np.ndarray, period: int = 14) -> np.ndarray:
+    delta = _diff(values)
+    gain = np.clip(delta, 0, None)
+    # 复用 delta 的缓冲区存放下跌幅度
+    loss = np.clip(delta, None, 0, out=delta)
+    np.negative(loss, out=loss)
+    # Wilder 平滑：alpha = 1 / period
+    avg_gain = _ewm_mean(gain, 1.0 / period, period)
+    avg_loss = _ewm_mean(loss, 1.0 / period, period)
+    return _bfill(_rsi_from_averages(avg_gain, avg_loss))
+
+
+def _rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    """由平均涨跌幅计算 RSI，结果写回 ``avg_gain`` 的缓冲区。"""
+    rsi = _masked_divide(avg_gain, avg_loss, out=avg_gain)
+    rsi += 1
+    np.divide(100, rsi, out=rsi)
+    return np.subtract(100, rsi, out=rsi)
 
 
-def _zscore(series: pd.Series, window: int) -> pd.Series:
-    rolling_mean = series.rolling(window=window, min_periods=window // 2).mean()
-    rolling_std = series.rolling(window=window, min_periods=window // 2).std(ddof=0)
-    zscore = (series - rolling_mean) / rolling_std.replace(0, np.nan)
-    return zscore.fillna(0.0)
+def _zscore(values: np.ndarray, window: int) -> np.ndarray:
+    rolling_mean, rolling_std = _roll_mean_std(values, window, window // 2)
+    zscore = np.subtract(values, rolling_mean, out=rolling_mean)
+    _masked_divide(zscore, rolling_std, out=zscore)
+    return _fillna(zscore, 0.0)
 
 
-def _stoch_rsi(rsi: pd.Series, period: int = 14) -> pd.Series:
-    rsi_min = rsi.rolling(period).min()
-    rsi_max = rsi.rolling(period).max()
-    stoch = (rsi - rsi_min) / (rsi_max - rsi_min).replace(0, np.nan)
-    return stoch.clip(0, 1).fillna(0.5)
+def _stoch_rsi(rsi: np.ndarray, period: int = 14) -> np.ndarray:
+    stoch = _range_position(rsi, rsi, rsi, period)
+    return _fillna(np.clip(stoch, 0, 1, out=stoch), 0.5)
 
 
-def _kdj(high: pd.Series, low: pd.Series, close: pd.Series, window: int = 9) -> tuple[pd.Series, pd.Series, pd.Series]:
-    low_min = low.rolling(window=window).min()
-    high_max = high.rolling(window=window).max()
-    rsv = ((close - low_min) / (high_max - low_min).replace(0, np.nan)) * 100
-    k = rsv.ewm(alpha=1 / 3, adjust=False).mean()
-    d = k.ewm(alpha=1 / 3, adjust=False).mean()
+def _kdj(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 9) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rsv = _rsv(high, low, close, window)
+    k = _ewm_mean(rsv, 1.0 / 3, 0)
+    d = _ewm_mean(k, 1.0 / 3, 0)
     j = 3 * k - 2 * d
-    return k.fillna(50), d.fillna(50), j.fillna(50)
-
-
-def _bollinger(series: pd.Series, period: int = 20, num_std: float = 2.0) -> tuple[pd.Series, pd.Series, pd.Series, pd.Series]:
-    mavg = series.rolling(period).mean()
-    std = series.rolling(period).std(ddof=0)
-    upper = mavg + num_std * std
-    lower = mavg - num_std * std
-    position = (series - lower) / (upper - lower).replace(0, np.nan)
-    return mavg, upper, lower, position.clip(0, 1).fillna(0.5)
-
-
-def _anchored_vwap(price: pd.Series, volume: pd.Series) -> float:
-    if volume.isna().all():
-        return float(price.iloc[-1])
-    last_ts = price.index[-1]
-    month_start = last_ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    mask = price.index >= month_start
-    price_slice = price.loc[mask]
-    volume_slice = volume.loc[mask]
-    cum_vol = volume_slice.cumsum()
-    cum_pv = (price_slice * volume_slice).cumsum()
-    valid = cum_vol.replace(0, np.nan)
-    vwap_series = cum_pv / valid
-    return float(vwap_series.iloc[-1])
+    return _fillna(k, 50.0), _fillna(d, 50.0), _fillna(j, 50.0)
+
+
+def _rsv(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 9) -> np.ndarray:
+    rsv = _range_position(close, low, high, window)
+    rsv *= 100
+    return rsv
+
+
+def _range_position(values: np.ndarray, low: np.ndarray, high: np.ndarray, window: int) -> np.ndarray:
+    """``values`` 在滚动区间 [min(low), max(high)] 中的相对位置，区间宽度为 0 时为 NaN。"""
+    if NUMBA_AVAILABLE:
+        return _range_position_kernel(values, low, high, window)
+    low_min = _roll_min(low, window)
+    high_max = _roll_max(high, window)
+    spread = np.subtract(high_max, low_min, out=high_max)
+    position = np.subtract(values, low_min, out=low_min)
+    return _masked_divide(position, spread, out=position)
+
+
+@njit(cache=True, nogil=True)
+def _range_position_kernel(values: np.ndarray, low: np.ndarray, high: np.ndarray, window: int) -> np.ndarray:
+    """单次遍历：两条单调队列分别维护滚动最小/最大值，并直接给出相对位置。"""
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    low_ring = np.empty(window, dtype=np.int64)
+    high_ring = np.empty(window, dtype=np.int64)
+    low_head = low_size = low_obs = 0
+    high_head = high_size = high_obs = 0
+    for i in range(n):
+        if i >= window:
+            if low[i - window] == low[i - window]:
+                low_obs -= 1
+            if high[i - window] == high[i - window]:
+                high_obs -= 1
+        if low_size > 0 and low_ring[low_head] <= i - window:
+            low_head = (low_head + 1) % window
+            low_size -= 1
+        if high_size > 0 and high_ring[high_head] <= i - window:
+            high_head = (high_head + 1) % window
+            high_size -= 1
+
+        cur = low[i]
+        if cur == cur:
+            low_obs += 1
+            while low_size > 0 and low[low_ring[(low_head + low_size - 1) % window]] >= cur:
+                low_size -= 1
+            low_ring[(low_head + low_size) % window] = i
+            low_size += 1
+        cur = high[i]
+        if cur == cur:
+            high_obs += 1
+            while high_size > 0 and high[high_ring[(high_head + high_size - 1) % window]] <= cur:
+                high_size -= 1
+            high_ring[(high_head + high_size) % window] = i
+            high_size += 1
+
+        if low_obs >= window and high_obs >= window:
+            floor = low[low_ring[low_head]]
+            spread = high[high_ring[high_head]] - floor
+            out[i] = np.nan if spread == 0 else (values[i] - floor) / spread
+        else:
+            out[i] = np.nan
+    return out
+
+
+def _bollinger(values: np.ndarray, period: int = 20, num_std: float = 2.0) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    mavg, std = _roll_mean_std(values, period, period)
+    std *= num_std
+    upper = mavg + std
+    lower = mavg - std
+    band = np.subtract(upper, lower, out=std)
+    position = np.subtract(values, lower)
+    _masked_divide(position, band, out=position)
+    return mavg, upper, lower, _fillna(np.clip(position, 0, 1, out=position), 0.5)
+
+
+def _anchored_vwap(index: pd.Index, price: np.ndarray, volume: np.ndarray) -> float:
+    if np.isnan(volume).all():
+        return float(price[-1])
+    month_start = _month_start(index[-1])
+    if index.is_monotonic_increasing:
+        # 有序索引直接二分定位月初，切片为视图，无需构造布尔掩码
+        start = index.searchsorted(month_start, side="left")
+        price_slice = price[start:]
+        volume_slice = volume[start:]
+    else:
+        mask = index >= month_start
+        price_slice = price[mask]
+        volume_slice = volume[mask]
+    if np.isnan(price_slice[-1] * volume_slice[-1]):
+        return float("nan")
+    cum_vol = np.nansum(volume_slice)
+    cum_pv = np.nansum(price_slice * volume_slice)
+    if cum_vol == 0:
+        return float("nan")
+    return float(cum_pv / cum_vol)
+
+
+def _month_start(ts: Any) -> Any:
+    return ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
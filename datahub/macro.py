@@ -6,31 +6,72 @@
 - 板块排行：基于 Tushare 的行业归类统计。
 - 市场宽度：统计涨跌家数、涨停/跌停等。
 
-所有接口均为异步，内部通过 asyncio.to_thread 调用同步库，
+所有接口均为异步，内部通过共享的 I/O 线程池（_to_io）调用同步库，
 默认带有 TTL 缓存以减少外部 API 请求频率。
 """
 
 from __future__ import annotations
 
 import asyncio
+import functools
+import json
 import logging
 import math
 import os
+import re
 import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, Iterable, List, Optional, Sequence
-
-from copy import deepcopy
+from datetime import datetime, time as dt_time, timezone, timedelta
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+from zoneinfo import ZoneInfo
 
 import numpy as np
 import pandas as pd
 import requests
 import yfinance as yf
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:  # pragma: no cover - 可选依赖
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:  # pragma: no cover - 可选依赖
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover
+    msgpack = None  # type: ignore
+
+try:  # pragma: no cover - 可选依赖
+    from requests_cache import CacheMixin  # type: ignore
+    from requests_ratelimiter import LimiterMixin  # type: ignore
+except ImportError:  # pragma: no cover
+    CacheMixin = LimiterMixin = None  # type: ignore
+
+try:  # pragma: no cover - 可选依赖
+    import httpx  # type: ignore
+except ImportError:  # pragma: no cover
+    httpx = None  # type: ignore
+
+try:  # pragma: no cover - 可选依赖（yfinance 依赖自带）
+    from curl_cffi import requests as curl_requests  # type: ignore
+except ImportError:  # pragma: no cover
+    curl_requests = None  # type: ignore
 
 from infra.cache_store import cache_manager
-
-from .akshare_api import AkShareUnavailable, fetch_northbound_intraday
+from infra.rate_limit import rate_limiter
+
+from ._njit import NUMBA_AVAILABLE, njit
+from .akshare_api import (
+    AkShareUnavailable,
+    fetch_cn_index_daily,
+    fetch_northbound_intraday,
+    is_available as akshare_is_available,
+)
 from .tushare_api import (
     TushareUnavailable,
     compute_industry_rankings,
@@ -43,7 +84,7 @@ from .tushare_api import (
     fetch_index_daily as ts_fetch_index_daily,
     get_latest_trade_date,
     get_pro,
-    select_leaders,
+    select_leaders_by_industry,
 )
 
 logger = logging.getLogger(__name__)
@@ -58,6 +99,8 @@ DEFAULT_INDICES: Dict[str, str] = {
     "dowjones": "^DJI",
     "hsci": "^HSI",  # 恒生指数
 }
+# 默认指数集合的缓存键，避免每次刷新重新排序拼接
+_DEFAULT_MAPPING_KEY = "|".join(sorted(DEFAULT_INDICES))
 
 
 AK_INDEX_FALLBACKS: Dict[str, Dict[str, str]] = {
@@ -85,43 +128,301 @@ GLOBAL_TUSHARE_CODES: Dict[str, str] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class _CacheEntry:
     payload: Any
-    timestamp: float
+    timestamp: float  # time.monotonic()，不受系统时钟校时影响
+    ttl: Optional[float] = None  # 条目自带的有效期，优先于调用方传入的 TTL
+    version: Optional[str] = None  # 以数据版本（如交易日）失效的缓存使用
+
+    def is_fresh(self, ttl_seconds: float) -> bool:
+        ttl = self.ttl if self.ttl is not None else ttl_seconds
+        return time.monotonic() - self.timestamp < ttl
+
+
+class _TTLCache(OrderedDict):
+    """按最近使用顺序淘汰的有界缓存。
+
+    条目是否过期由 _CacheEntry 按调用方 TTL 判断；过期条目不主动删除，
+    留作抓取失败时的回退数据，直至被 LRU 淘汰。
+    """
+
+    def __init__(self, maxsize: int = 64) -> None:
+        super().__init__()
+        self.maxsize = maxsize
 
+    def get(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
 
-_INDEX_CACHE: Dict[str, _CacheEntry] = {}
-_SECTOR_CACHE: Dict[str, _CacheEntry] = {}
-_BREADTH_CACHE: Optional[_CacheEntry] = None
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+_CACHE_MAXSIZE = 64
+_INDEX_CACHE = _TTLCache(_CACHE_MAXSIZE)
+_SECTOR_CACHE = _TTLCache(_CACHE_MAXSIZE)
+_BREADTH_CACHE = _TTLCache(_CACHE_MAXSIZE)
 _NORTHBOUND_CACHE: Optional[_CacheEntry] = None
 _LHB_CACHE: Optional[_CacheEntry] = None
 _NEWS_CACHE: Optional[_CacheEntry] = None
-_DAILY_CACHE: Dict[str, _CacheEntry] = {}
+_DAILY_CACHE = _TTLCache(5)
 _STOCK_BASIC_CACHE: Optional[_CacheEntry] = None
 _MACRO_CACHE: Optional[_CacheEntry] = None
+_TRADE_DATE_CACHE: Dict[int, _CacheEntry] = {}
+_TRADE_DATE_TTL = 60
 
 def _macro_cache_key() -> str:
+    # 不同编码格式使用不同的键，避免读到另一种格式写入的旧数据
+    if msgpack is not None:
+        return "macro::snapshot::msgpack"
     return "macro::snapshot"
 
 MACRO_SNAPSHOT_TTL = int(os.getenv("MACRO_SNAPSHOT_TTL", "7200"))
+MACRO_INDEX_CONCURRENCY = int(os.getenv("MACRO_INDEX_CONCURRENCY", "4"))
+
+_CN_TZ = ZoneInfo("Asia/Shanghai")
+_US_TZ = ZoneInfo("America/New_York")
+# 交易时段（本地时间）：A 股 09:30-15:00，美股 09:30-16:00
+_CN_SESSION = (dt_time(9, 30), dt_time(15, 0))
+_US_SESSION = (dt_time(9, 30), dt_time(16, 0))
+INDEX_TTL_OPEN = 60
+INDEX_TTL_CLOSED = 8 * 3600
+
+
+def _in_session(now: datetime, tz: ZoneInfo, session: tuple) -> bool:
+    local = now.astimezone(tz)
+    return local.weekday() < 5 and session[0] <= local.time() < session[1]
+
+
+def _index_ttl(now: Optional[datetime] = None) -> int:
+    """指数快照的 TTL：A 股或美股盘中 60 秒，休市时 8 小时。"""
+
+    now = now or datetime.now(timezone.utc)
+    if _in_session(now, _CN_TZ, _CN_SESSION) or _in_session(now, _US_TZ, _US_SESSION):
+        return INDEX_TTL_OPEN
+    return INDEX_TTL_CLOSED
+
 
+def _seconds_until_next_session_open(now: Optional[datetime] = None) -> int:
+    """距离下一个 A 股开盘（工作日 09:30，未考虑节假日）的秒数。"""
+
+    local = (now or datetime.now(timezone.utc)).astimezone(_CN_TZ)
+    candidate = local.replace(hour=9, minute=30, second=0, microsecond=0)
+    if candidate <= local:
+        candidate += timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+    return int((candidate - local).total_seconds())
+
+
+def _cn_today() -> str:
+    return datetime.now(_CN_TZ).strftime("%Y%m%d")
+
+
+def _build_http_session() -> Any:
+    """进程级复用的 HTTP 会话（目前用于 Finnhub）。
+
+    - 设置 FINNHUB_IMPERSONATE=1 且安装了 curl_cffi 时，使用模拟 Chrome 指纹的会话；
+    - 安装了 requests_cache + requests_ratelimiter 时，响应落盘缓存并限制频率
+      （每分钟 60 次、每小时 360 次）；
+    - 否则为普通 Session。requests 会话统一保持连接，并对 429/5xx 做指数退避重试。
+    """
+
+    if os.getenv("FINNHUB_IMPERSONATE") == "1" and curl_requests is not None:
+        return curl_requests.Session(impersonate="chrome")
+
+    if _HTTP_CACHE_AVAILABLE:
+
+        class _CachedLimiterSession(CacheMixin, LimiterMixin, requests.Session):
+            pass
+
+        cache_dir = os.getenv("CACHE_DIR", "./cache")
+        os.makedirs(cache_dir, exist_ok=True)
+        session = _CachedLimiterSession(
+            cache_name=os.path.join(cache_dir, "http_cache.sqlite"),
+            backend="sqlite",
+            expire_after=HTTP_CACHE_TTL,
+            # from/to 随当前时间滚动，不参与缓存键；同一指数在 TTL 内命中缓存
+            ignored_parameters=["token", "from", "to"],
+            per_minute=60,
+            per_hour=360,
+        )
+    else:
+        session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+HTTP_CACHE_TTL = int(os.getenv("MACRO_HTTP_CACHE_TTL", "600"))
+
+# 宏观模块的阻塞调用均为网络 I/O，使用独立线程池，避免与默认执行器
+# （min(32, cpu+4) 个线程）上的其它任务相互挤占
+_IO_POOL = ThreadPoolExecutor(
+    max_workers=max(int(os.getenv("MACRO_IO_POOL", "32")), 1),
+    thread_name_prefix="macro-io",
+)
 
-def _get_from_cache(cache: Dict[str, _CacheEntry], key: str, ttl: int) -> Optional[Any]:
+
+async def _to_io(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_IO_POOL, functools.partial(func, *args, **kwargs))
+
+
+# 模块内所有 AkShare 调用共享的并发上限，避免多个子任务同时打点触发限流；
+# 信号量按事件循环各建一个（调度器与脚本各自 asyncio.run）
+AKSHARE_CONCURRENCY = max(int(os.getenv("AKSHARE_CONCURRENCY", "6")), 1)
+_AKSHARE_SEMS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _ak_call(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    sem = _AKSHARE_SEMS.get(loop)
+    if sem is None:
+        sem = _AKSHARE_SEMS[loop] = asyncio.Semaphore(AKSHARE_CONCURRENCY)
+    async with sem, rate_limiter.limit("akshare"):
+        return await _to_io(func, *args, **kwargs)
+
+
+# 安装了 httpx 且未要求模拟浏览器指纹时，Finnhub 走原生异步客户端；
+# 客户端与连接池绑定事件循环，因此同样按循环各建一个。
+# 若安装了 requests_cache + requests_ratelimiter，则由 requests 会话统一负责
+# 响应缓存与限频，不再使用 httpx，避免两条通道各自绕过对方的缓存与限流
+_HTTP_CACHE_AVAILABLE = CacheMixin is not None and LimiterMixin is not None
+_USE_HTTPX = httpx is not None and os.getenv("FINNHUB_IMPERSONATE") != "1" and not _HTTP_CACHE_AVAILABLE
+_HTTPX_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+def _httpx_client() -> "httpx.AsyncClient":
+    loop = asyncio.get_running_loop()
+    client = _HTTPX_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+            transport=httpx.AsyncHTTPTransport(retries=2),
+        )
+        _HTTPX_CLIENTS[loop] = client
+    return client
+
+
+async def aclose_http_clients() -> None:
+    """关闭当前事件循环上的 httpx 客户端，供应用关闭时调用。"""
+
+    client = _HTTPX_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def _call_async(func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+    return await func(*args, **kwargs)
+
+
+# 导入时确定各数据源是否已配置，未配置的数据源不再调度线程去探测
+_FINNHUB_ENABLED = bool(os.getenv("FINNHUB_API_KEY"))
+_TUSHARE_ENABLED = bool(os.getenv("TUSHARE_TOKEN") or os.getenv("TUSHARE_TOKEN_POOL"))
+_HTTP = _build_http_session()
+
+
+def _get_from_cache(cache: _TTLCache, key: str, ttl: int) -> Optional[Any]:
     entry = cache.get(key)
-    if entry and time.time() - entry.timestamp < ttl:
+    if entry and entry.is_fresh(ttl):
         return entry.payload
     return None
 
 
-def _set_cache(cache: Dict[str, _CacheEntry], key: str, payload: Any) -> None:
-    cache[key] = _CacheEntry(payload=payload, timestamp=time.time())
+def _get_stale(cache: _TTLCache, key: str) -> Optional[Any]:
+    """读取缓存（忽略时效），用于抓取失败时回退。"""
+
+    entry = cache.get(key)
+    return entry.payload if entry else None
+
+
+def _set_cache(cache: _TTLCache, key: str, payload: Any) -> None:
+    cache[key] = _CacheEntry(payload=payload, timestamp=time.monotonic())
+
+
+def _freeze(value: Any) -> Any:
+    """把参数转换为可哈希的键（dict / list 等按内容冻结）。"""
+
+    if isinstance(value, Mapping):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_freeze(item) for item in value]
+        return tuple(sorted(items, key=repr)) if isinstance(value, (set, frozenset)) else tuple(items)
+    return value
+
+
+def _single_flight(func: Callable[..., Any]) -> Callable[..., Any]:
+    """相同参数的并发调用共享同一次执行，避免缓存失效瞬间重复请求外部接口。
+
+    进行中的任务按事件循环区分（调度器与脚本各自 asyncio.run）；调用方被取消时
+    不影响共享任务，其结果照常写入缓存。
+    """
+
+    pending: Dict[Any, asyncio.Task] = {}
+
+    def _finish(key: Any, task: asyncio.Task) -> None:
+        if pending.get(key) is task:
+            del pending[key]
+        if not task.cancelled():
+            task.exception()  # 标记异常已读取，所有等待方都已取消时不再告警
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = (_freeze(args), _freeze(kwargs))
+        loop = asyncio.get_running_loop()
+        task = pending.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(func(*args, **kwargs))
+            pending[key] = task
+            task.add_done_callback(functools.partial(_finish, key))
+        return await asyncio.shield(task)
+
+    return wrapper
+
+
+async def _trade_date(offset: int = 0) -> Optional[str]:
+    """get_latest_trade_date 的异步封装：结果缓存一分钟，并发调用共享同一次请求。"""
+
+    entry = _TRADE_DATE_CACHE.get(offset)
+    if entry and entry.is_fresh(_TRADE_DATE_TTL):
+        return entry.payload
+    return await _fetch_trade_date(offset)
 
 
-def _get_daily_snapshot(trade_date: str, ttl_seconds: int = 600) -> Optional[pd.DataFrame]:
+@_single_flight
+async def _fetch_trade_date(offset: int) -> Optional[str]:
+    trade_date = await _to_io(get_latest_trade_date, offset)
+    _TRADE_DATE_CACHE[offset] = _CacheEntry(payload=trade_date, timestamp=time.monotonic())
+    return trade_date
+
+
+def _get_daily_snapshot(trade_date: str) -> Optional[pd.DataFrame]:
+    """按交易日缓存全市场日行情；交易日本身即版本号，命中后无需再判断时效。
+
+    返回的是缓存中的同一个 DataFrame，调用方只能读取，不得原地修改。
+    """
+
     entry = _DAILY_CACHE.get(trade_date)
-    if entry and time.time() - entry.timestamp < ttl_seconds:
-        return entry.payload.copy()
+    if entry is not None:
+        return entry.payload
     try:
         df = fetch_daily(trade_date)
     except TushareUnavailable as exc:
@@ -129,16 +430,21 @@ def _get_daily_snapshot(trade_date: str, ttl_seconds: int = 600) -> Optional[pd.
         return None
     if df is None or df.empty:
         return None
-    payload = df.copy()
-    _DAILY_CACHE[trade_date] = _CacheEntry(payload=payload, timestamp=time.time())
+    payload = df
+    _DAILY_CACHE[trade_date] = _CacheEntry(payload=payload, timestamp=time.monotonic())
     return payload
 
 
-def _get_stock_basic(ttl_seconds: int = 6 * 3600) -> Optional[pd.DataFrame]:
+def _get_stock_basic() -> Optional[pd.DataFrame]:
+    """股票基础信息按自然日失效（以 Asia/Shanghai 日期为版本号）。
+
+    与 _get_daily_snapshot 相同，返回的缓存 DataFrame 只读。
+    """
+
     global _STOCK_BASIC_CACHE
-    if _STOCK_BASIC_CACHE and time.time() - _STOCK_BASIC_CACHE.timestamp < ttl_seconds:
-        payload = _STOCK_BASIC_CACHE.payload
-        return payload.copy() if isinstance(payload, pd.DataFrame) else payload
+    today = _cn_today()
+    if _STOCK_BASIC_CACHE and _STOCK_BASIC_CACHE.version == today:
+        return _STOCK_BASIC_CACHE.payload
     try:
         df = fetch_stock_basic(fields="ts_code,name,industry")
     except TushareUnavailable as exc:
@@ -146,20 +452,14 @@ def _get_stock_basic(ttl_seconds: int = 6 * 3600) -> Optional[pd.DataFrame]:
         return None
     if df is None or df.empty:
         return None
-    payload = df.copy()
-    _STOCK_BASIC_CACHE = _CacheEntry(payload=payload, timestamp=time.time())
+    payload = df
+    _STOCK_BASIC_CACHE = _CacheEntry(payload=payload, timestamp=time.monotonic(), version=today)
     return payload
 
 
-def _prepare_index_dataframe(df: Optional[pd.DataFrame]) -> pd.DataFrame:
-    if df is None or df.empty:
-        return pd.DataFrame()
-
-    result = df.copy()
-    if isinstance(result.columns, pd.MultiIndex):
-        result.columns = [str(col[-1]) if isinstance(col, tuple) else str(col) for col in result.columns]
-
-    rename_map = {
+# 指数行情列名（小写、去空白后）到统一列名的映射
+_INDEX_RENAME: Mapping[str, str] = MappingProxyType(
+    {
         "adj close": "Close",
         "close": "Close",
         "收盘": "Close",
@@ -173,127 +473,410 @@ def _prepare_index_dataframe(df: Optional[pd.DataFrame]) -> pd.DataFrame:
         "volume": "Volume",
         "成交量": "Volume",
     }
+)
+
+
+def _rename_index_column(col: Any) -> str:
+    label = str(col)
+    return _INDEX_RENAME.get(label.lower().strip(), label)
+
 
-    new_columns: Dict[str, str] = {}
-    for col in result.columns:
-        key = str(col).lower().strip()
-        new_columns[col] = rename_map.get(key, str(col))
-    result.rename(columns=new_columns, inplace=True)
+# 已是统一列名时无需逐列重命名
+_INDEX_CANONICAL = frozenset({"Open", "High", "Low", "Close", "Volume"})
 
-    result = result.loc[:, ~result.columns.duplicated()]
-    result.dropna(how="all", inplace=True)
+
+def _prepare_index_dataframe(df: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """统一指数行情列名并剔除重复列与全空行；无需调整时直接返回原 DataFrame（只读使用）。"""
+
+    if df is None or df.empty:
+        return pd.DataFrame()
+
+    columns = df.columns
+    if isinstance(columns, pd.MultiIndex):
+        columns = pd.Index([str(col[-1]) for col in columns])
+    if not _INDEX_CANONICAL.issubset(columns):
+        columns = columns.map(_rename_index_column)
+
+    result = df
+    if columns is not df.columns:
+        # 浅拷贝只替换列索引，不复制底层数据，也不改动调用方（如共享的 yfinance 批量结果）
+        result = df.copy(deep=False)
+        result.columns = columns
+    if columns.has_duplicates:
+        result = result.loc[:, ~columns.duplicated()]
+    keep = result.notna().any(axis=1)
+    if not keep.all():
+        result = result[keep]
     return result
 
 
+class _SourceGate:
+    """单个数据源的调用闸门：限制并发数，可选按 provider 走全局令牌桶，并保证相邻请求之间的最小间隔。"""
+
+    def __init__(
+        self,
+        limit: int,
+        interval: float = 0.0,
+        runner: Callable[..., Awaitable[Any]] = _to_io,
+        provider: Optional[str] = None,
+    ) -> None:
+        self._sem = asyncio.Semaphore(max(limit, 1))
+        self._interval = max(interval, 0.0)
+        self._last_call = 0.0
+        self._runner = runner
+        self._provider = provider
+
+    async def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        async with self._sem:
+            wait_for = self._last_call + self._interval - time.monotonic()
+            if wait_for > 0:
+                await asyncio.sleep(wait_for)
+            try:
+                if self._provider is None:
+                    return await self._runner(func, *args, **kwargs)
+                async with rate_limiter.limit(self._provider):
+                    return await self._runner(func, *args, **kwargs)
+            finally:
+                self._last_call = time.monotonic()
+
+
+def _index_source_gates(throttle_seconds: float) -> Dict[str, _SourceGate]:
+    # yfinance / AkShare 对并发与频率敏感：保持串行，频率交给全局令牌桶（YF_MAX_RPM / AK_MAX_RPM），
+    # 空闲后的首个请求无需等待；throttle_seconds 仅作为额外的最小间隔。
+    # AkShare 的令牌在 _ak_call 内领取，与北向资金等调用共用同一个桶。
+    return {
+        "tushare": _SourceGate(2),
+        "tushare_global": _SourceGate(2),
+        "yfinance": _SourceGate(1, throttle_seconds, provider="yfinance"),
+        "finnhub": _SourceGate(2, runner=_call_async if _USE_HTTPX else _to_io),
+        "akshare": _SourceGate(1, throttle_seconds, runner=_ak_call),
+    }
+
+
+# 只需最近两根日线；"5d" 是 Yahoo 原生支持的最短多日区间（按交易日计）。
+# "2d" 在 yfinance 中属于自定义区间，会按自然日裁剪，长假后可能取不到前收盘。
+_YF_INDEX_PERIOD = "5d"
+
+
+def _download_yahoo(codes: Sequence[str]) -> Optional[pd.DataFrame]:
+    return yf.download(
+        tickers=list(codes),
+        period=_YF_INDEX_PERIOD,
+        interval="1d",
+        prepost=False,
+        actions=False,
+        group_by="ticker",
+        threads=False,
+        progress=False,
+        auto_adjust=False,
+    )
+
+
+def _slice_ticker_frame(df: Optional[pd.DataFrame], code: str) -> Optional[pd.DataFrame]:
+    """从 group_by="ticker" 的多代码结果中切出单个代码的行情。"""
+
+    if df is None or df.empty:
+        return None
+    if isinstance(df.columns, pd.MultiIndex):
+        if code not in df.columns.get_level_values(0):
+            return None
+        df = df[code]
+    df = df.dropna(how="all")
+    return df if not df.empty else None
+
+
+class _YahooBatch:
+    """首个需要 yfinance 的指数触发一次多代码下载，其余指数共享该结果。"""
+
+    def __init__(self, codes: Iterable[str], gate: _SourceGate) -> None:
+        self._codes = list(dict.fromkeys(code for code in codes if code))
+        self._gate = gate
+        self._task: Optional[asyncio.Future] = None
+
+    async def get(self, code: str) -> Optional[pd.DataFrame]:
+        if code not in self._codes:
+            data = await self._gate.call(_download_yahoo, [code])
+            return _slice_ticker_frame(data, code)
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._gate.call(_download_yahoo, self._codes))
+        # 多个指数共享同一次下载，单个等待方被取消时不能连带取消下载本身
+        data = await asyncio.shield(self._task)
+        return _slice_ticker_frame(data, code)
+
+
+def _fast_numeric(obj: pd.Series) -> np.ndarray:
+    """数值列直接取底层数组，仅对 object 等列做 to_numeric 转换。"""
+
+    if obj.dtype.kind in "fiu":
+        return obj.to_numpy(dtype=np.float64, copy=False)
+    return pd.to_numeric(obj, errors="coerce").to_numpy()
+
+
+class _IndexSlice(NamedTuple):
+    """备用数据源直接给出的最近收盘价与成交量（按时间升序），无需构造 DataFrame。"""
+
+    close: np.ndarray
+    volume: np.ndarray
+
+
+_IndexData = Union[pd.DataFrame, _IndexSlice]
+
+
+def _build_index_entry(code: str, data: _IndexData, source_label: str) -> Optional[Dict[str, Any]]:
+    if isinstance(data, _IndexSlice):
+        if not data.close.size:
+            return None
+        return _index_entry_from_arrays(code, data.close[-2:], data.volume[-2:], source_label)
+
+    df = _prepare_index_dataframe(data)
+    if df.empty or "Close" not in df.columns:
+        return None
+
+    df = df.tail(2)
+    close_obj = df["Close"]
+    if isinstance(close_obj, pd.DataFrame):
+        close_obj = close_obj.iloc[:, 0]
+    close_arr = _fast_numeric(close_obj)
+
+    if "Volume" in df.columns:
+        volume_obj = df["Volume"]
+        if isinstance(volume_obj, pd.DataFrame):
+            volume_obj = volume_obj.iloc[:, 0]
+        volume_arr = _fast_numeric(volume_obj)
+    else:
+        volume_arr = np.array([])
+    return _index_entry_from_arrays(code, close_arr, volume_arr, source_label)
+
+
+def _index_entry_from_arrays(
+    code: str,
+    close_arr: np.ndarray,
+    volume_arr: np.ndarray,
+    source_label: str,
+) -> Dict[str, Any]:
+    close = float(close_arr[-1]) if close_arr.size else float("nan")
+    prev_close = float(close_arr[-2]) if close_arr.size > 1 else float("nan")
+    change_pct = float(((close - prev_close) / prev_close) * 100) if np.isfinite(prev_close) and prev_close not in (0, float("nan")) else 0.0
+
+    volume = float(volume_arr[-1]) if volume_arr.size else float("nan")
+    prev_volume = float(volume_arr[-2]) if volume_arr.size > 1 else float("nan")
+    volume_change_pct = (
+        float(((volume - prev_volume) / prev_volume) * 100)
+        if np.isfinite(volume) and np.isfinite(prev_volume) and prev_volume != 0
+        else 0.0
+    )
+    return {
+        "symbol": code,
+        "close": round(close, 3),
+        "change_pct": round(change_pct, 3),
+        "volume": volume if np.isfinite(volume) else None,
+        "volume_change_pct": round(volume_change_pct, 3),
+        "source": source_label,
+    }
+
+
+@dataclass
+class _SourceHealth:
+    last_success: float = 0.0
+    failures: int = 0
+    retry_at: float = 0.0
+
+
+# 指数名 -> 数据源 -> 最近的成功/失败记录，用于调整各数据源的尝试顺序
+_SOURCE_HEALTH: Dict[str, Dict[str, _SourceHealth]] = {}
+_SOURCE_BACKOFF_MAX = 300.0
+
+
+def _index_sources(name: str, code: str) -> List[str]:
+    """指数可用的数据源，按默认优先级排列；未配置或未安装的数据源直接跳过。"""
+
+    sources: List[str] = []
+    if _TUSHARE_ENABLED and name in TUSHARE_INDEX_CODES:
+        sources.append("tushare")
+    if _TUSHARE_ENABLED and name in GLOBAL_TUSHARE_CODES:
+        sources.append("tushare_global")
+    if code:
+        sources.append("yfinance")
+    if _FINNHUB_ENABLED and name in FINNHUB_INDEX_SYMBOLS:
+        sources.append("finnhub")
+    if name in AK_INDEX_FALLBACKS and akshare_is_available():
+        sources.append("akshare")
+    return sources
+
+
+def _rank_sources(name: str, sources: List[str]) -> Tuple[List[str], List[str]]:
+    """将数据源分为（可用, 退避中）两组，组内最近成功的优先、其次按默认顺序。"""
+
+    health = _SOURCE_HEALTH.get(name, {})
+    now = time.monotonic()
+
+    def _key(item: tuple) -> tuple:
+        pos, source = item
+        state = health.get(source)
+        return (-state.last_success if state else 0.0, pos)
+
+    ready: List[str] = []
+    backoff: List[str] = []
+    for _, source in sorted(enumerate(sources), key=_key):
+        state = health.get(source)
+        (backoff if state and state.retry_at > now else ready).append(source)
+    return ready, backoff
+
+
+def _record_source(name: str, source: str, ok: bool) -> None:
+    state = _SOURCE_HEALTH.setdefault(name, {}).setdefault(source, _SourceHealth())
+    now = time.monotonic()
+    if ok:
+        state.last_success = now
+        state.failures = 0
+        state.retry_at = 0.0
+    else:
+        state.failures += 1
+        state.retry_at = now + min(_SOURCE_BACKOFF_MAX, 2.0 ** state.failures)
+
+
+async def _fetch_index_from_source(
+    source: str,
+    name: str,
+    code: str,
+    gates: Dict[str, _SourceGate],
+    yahoo: "_YahooBatch",
+) -> Optional[_IndexData]:
+    if source == "tushare":
+        return await gates[source].call(_fetch_index_from_tushare, TUSHARE_INDEX_CODES[name])
+    if source == "tushare_global":
+        return await gates[source].call(_fetch_global_index_from_tushare, GLOBAL_TUSHARE_CODES[name])
+    if source == "yfinance":
+        return await yahoo.get(code)
+    if source == "finnhub":
+        fetch = _fetch_index_from_finnhub_async if _USE_HTTPX else _fetch_index_from_finnhub
+        return await gates[source].call(fetch, FINNHUB_INDEX_SYMBOLS[name])
+    if source == "akshare":
+        return await gates[source].call(_fetch_index_from_akshare, name)
+    return None
+
+
+async def _try_index_source(
+    source: str,
+    name: str,
+    code: str,
+    gates: Dict[str, _SourceGate],
+    yahoo: "_YahooBatch",
+) -> Optional[Dict[str, Any]]:
+    try:
+        data = await _fetch_index_from_source(source, name, code, gates, yahoo)
+    except Exception as exc:  # pragma: no cover - 网络异常
+        logger.warning("获取指数 %s 数据失败（%s）: %s", code or name, source, exc)
+        data = None
+    entry = _build_index_entry(code, data, source) if data is not None else None
+    _record_source(name, source, entry is not None)
+    return entry
+
+
+async def _race_index_sources(
+    sources: Sequence[str],
+    name: str,
+    code: str,
+    gates: Dict[str, _SourceGate],
+    yahoo: "_YahooBatch",
+) -> Optional[Dict[str, Any]]:
+    """并发请求多个备用数据源，采用最先返回的有效结果并取消其余请求。"""
+
+    pending = {
+        asyncio.ensure_future(_try_index_source(source, name, code, gates, yahoo))
+        for source in sources
+    }
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                entry = task.result()
+                if entry is not None:
+                    return entry
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _fetch_index_entry(
+    name: str,
+    code: str,
+    gates: Dict[str, _SourceGate],
+    yahoo: "_YahooBatch",
+) -> Optional[Dict[str, Any]]:
+    """拉取单个指数：默认 Tushare → yfinance → Finnhub → AkShare，并按近期成败调整顺序。
+
+    先请求首选数据源；失败后其余可用数据源并发竞速，取最先返回的有效数据；
+    都失败时再依次尝试退避中的数据源。
+    """
+
+    ready, backoff = _rank_sources(name, _index_sources(name, code))
+    if ready:
+        entry = await _try_index_source(ready[0], name, code, gates, yahoo)
+        if entry is None and len(ready) > 1:
+            entry = await _race_index_sources(ready[1:], name, code, gates, yahoo)
+        if entry is not None:
+            return entry
+    for source in backoff:
+        entry = await _try_index_source(source, name, code, gates, yahoo)
+        if entry is not None:
+            return entry
+    return None
+
+
+@_single_flight
 async def get_index_snapshot(
     symbols: Optional[Dict[str, str]] = None,
-    ttl_seconds: int = 1800,
-    throttle_seconds: float = 1.5,
+    ttl_seconds: Optional[int] = None,
+    throttle_seconds: float = 0.0,
 ) -> Dict[str, Dict[str, float]]:
-    """获取主要指数的价格、涨跌幅及成交量变化。"""
-
-    mapping = symbols or DEFAULT_INDICES
-    cache_key = "|".join(sorted(mapping.keys()))
+    """获取主要指数的价格、涨跌幅及成交量变化。
+
+    各指数并发拉取，总并发由 MACRO_INDEX_CONCURRENCY 控制；
+    yfinance / AkShare 的请求频率由 infra.rate_limit 的令牌桶约束，
+    throttle_seconds 仅作为相邻请求额外的最小间隔（默认不等待）。
+    未指定 ttl_seconds 时按交易时段取 TTL（见 _index_ttl）。
+    """
+
+    if ttl_seconds is None:
+        ttl_seconds = _index_ttl()
+    if symbols:
+        mapping = symbols
+        cache_key = "|".join(sorted(mapping.keys()))
+    else:
+        mapping = DEFAULT_INDICES
+        cache_key = _DEFAULT_MAPPING_KEY
     cached = _get_from_cache(_INDEX_CACHE, cache_key, ttl_seconds)
     if cached is not None:
         return cached
 
     snapshot: Dict[str, Dict[str, float]] = {}
-    backup = cached  # 失败时使用旧数据
-
-    for idx, (name, code) in enumerate(mapping.items()):
-        df: Optional[pd.DataFrame] = None
-        source_label = ""
-
-        if name in TUSHARE_INDEX_CODES:
-            df = await asyncio.to_thread(
-                _fetch_index_from_tushare,
-                TUSHARE_INDEX_CODES[name],
-            )
-            if df is not None and not df.empty:
-                source_label = "tushare"
-
-        if (df is None or df.empty) and name in GLOBAL_TUSHARE_CODES:
-            df = await asyncio.to_thread(
-                _fetch_global_index_from_tushare,
-                GLOBAL_TUSHARE_CODES[name],
-            )
-            if df is not None and not df.empty:
-                source_label = "tushare_global"
-
-        if (df is None or df.empty) and code:
-            try:
-                df = await asyncio.to_thread(
-                    yf.download,
-                    code,
-                    period="5d",
-                    progress=False,
-                    auto_adjust=False,
-                )
-                if df is not None and not df.empty:
-                    source_label = "yfinance"
-            except Exception as exc:  # pragma: no cover - 网络异常
-                logger.warning("获取指数 %s 数据失败: %s", code, exc)
-
-        if (df is None or df.empty) and name in FINNHUB_INDEX_SYMBOLS:
-            df = await asyncio.to_thread(
-                _fetch_index_from_finnhub,
-                FINNHUB_INDEX_SYMBOLS[name],
-            )
-            if df is not None and not df.empty:
-                source_label = "finnhub"
-
-        if (df is None or df.empty) and name in ("sh000300", "sz399006"):
-            df = await asyncio.to_thread(_fetch_index_from_akshare, name)
-            if df is not None and not df.empty:
-                source_label = "akshare"
+    backup = _get_stale(_INDEX_CACHE, cache_key)  # 失败时使用旧数据
+
+    sem = asyncio.Semaphore(max(MACRO_INDEX_CONCURRENCY, 1))
+    gates = _index_source_gates(throttle_seconds)
+    # 启用 Tushare 时 A 股指数优先走 Tushare，仅其余指数参与 yfinance 的批量下载；
+    # 未配置 Tushare 时 A 股指数同样由 yfinance 获取，一并放入批量下载
+    yahoo = _YahooBatch(
+        (code for name, code in mapping.items() if not (_TUSHARE_ENABLED and name in TUSHARE_INDEX_CODES)),
+        gates["yfinance"],
+    )
 
-        if df is None or df.empty:
-            if idx < len(mapping) - 1 and throttle_seconds > 0:
-                await asyncio.sleep(throttle_seconds)
-            continue
+    async def _fetch_one(name: str, code: str) -> Optional[Dict[str, Any]]:
+        async with sem:
+            return await _fetch_index_entry(name, code, gates, yahoo)
 
-        df = _prepare_index_dataframe(df)
-        if df.empty or "Close" not in df.columns:
-            if idx < len(mapping) - 1 and throttle_seconds > 0:
-                await asyncio.sleep(throttle_seconds)
+    results = await asyncio.gather(
+        *(_fetch_one(name, code) for name, code in mapping.items()),
+        return_exceptions=True,
+    )
+    for name, result in zip(mapping.keys(), results):
+        if isinstance(result, BaseException):
+            logger.warning("获取指数 %s 数据失败: %s", name, result)
             continue
-
-        df = df.tail(2).copy()
-        close_obj = df["Close"]
-        if isinstance(close_obj, pd.DataFrame):
-            close_obj = close_obj.iloc[:, 0]
-        close_series = pd.to_numeric(close_obj, errors="coerce")
-        close_arr = close_series.to_numpy()
-        close = float(close_arr[-1]) if close_arr.size else float("nan")
-        prev_close = float(close_arr[-2]) if close_arr.size > 1 else float("nan")
-        change_pct = float(((close - prev_close) / prev_close) * 100) if np.isfinite(prev_close) and prev_close not in (0, float("nan")) else 0.0
-
-        if "Volume" in df.columns:
-            volume_obj = df["Volume"]
-            if isinstance(volume_obj, pd.DataFrame):
-                volume_obj = volume_obj.iloc[:, 0]
-            volume_series = pd.to_numeric(volume_obj, errors="coerce")
-            volume_arr = volume_series.to_numpy()
-        else:
-            volume_arr = np.array([])
-        volume = float(volume_arr[-1]) if volume_arr.size else float("nan")
-        prev_volume = float(volume_arr[-2]) if volume_arr.size > 1 else float("nan")
-        volume_change_pct = (
-            float(((volume - prev_volume) / prev_volume) * 100)
-            if np.isfinite(volume) and np.isfinite(prev_volume) and prev_volume != 0
-            else 0.0
-        )
-        snapshot[name] = {
-            "symbol": code,
-            "close": round(close, 3),
-            "change_pct": round(change_pct, 3),
-            "volume": volume if np.isfinite(volume) else None,
-            "volume_change_pct": round(volume_change_pct, 3),
-            "source": source_label,
-        }
-        if idx < len(mapping) - 1 and throttle_seconds > 0:
-            await asyncio.sleep(throttle_seconds)
+        if result:
+            snapshot[name] = result
 
     if snapshot:
         _set_cache(_INDEX_CACHE, cache_key, snapshot)
@@ -307,6 +890,7 @@ async def get_index_snapshot(
     return {}
 
 
+@_single_flight
 async def get_sector_rankings(
     market: str = "cn",
     limit: int = 5,
@@ -322,20 +906,63 @@ async def get_sector_rankings(
     rankings: Dict[str, List[Dict[str, Any]]] = {"top": [], "bottom": []}
 
     if market == "cn":
-        trade_date = await asyncio.to_thread(get_latest_trade_date)
+        trade_date = await _trade_date()
         if not trade_date:
             trade_date = datetime.now().strftime("%Y%m%d")
-        daily_df = await asyncio.to_thread(_get_daily_snapshot, trade_date)
-        stock_basic = await asyncio.to_thread(_get_stock_basic)
+        daily_df = await _to_io(_get_daily_snapshot, trade_date)
+        stock_basic = await _to_io(_get_stock_basic)
         if daily_df is not None and stock_basic is not None:
-            top_df, bottom_df = compute_industry_rankings(daily_df, stock_basic, top_n=limit)
-            rankings["top"] = _convert_industry_rows(top_df, daily_df, stock_basic, top=True)
-            rankings["bottom"] = _convert_industry_rows(bottom_df, daily_df, stock_basic, top=False)
+            # 排名与龙头筛选均为 pandas 计算，整体放到 I/O 线程池，避免阻塞事件循环
+            rankings = await _to_io(_build_sector_rankings, daily_df, stock_basic, limit)
 
     _set_cache(_SECTOR_CACHE, cache_key, rankings)
     return rankings
 
 
+def _build_sector_rankings(
+    daily_df: pd.DataFrame,
+    stock_basic: pd.DataFrame,
+    limit: int,
+) -> Dict[str, List[Dict[str, Any]]]:
+    top_df, bottom_df = compute_industry_rankings(daily_df, stock_basic, top_n=limit)
+    return {
+        "top": _convert_industry_rows(top_df, daily_df, stock_basic, top=True),
+        "bottom": _convert_industry_rows(bottom_df, daily_df, stock_basic, top=False),
+    }
+
+
+def _column_values(df: pd.DataFrame, column: Optional[Any]) -> Sequence[Any]:
+    """按列取值用于逐行拼装，缺列时返回 None 序列（等价于 row.get）。"""
+
+    if column is not None and column in df.columns:
+        return df[column].tolist()
+    return [None] * len(df)
+
+
+def _rounded_values(df: pd.DataFrame, column: Optional[Any], digits: int = 3) -> List[Optional[float]]:
+    """整列 np.round 后取值，非有限值为 None；等价于逐行 _safe_round。"""
+
+    if column is None or column not in df.columns:
+        return [None] * len(df)
+    series = df[column]
+    if not pd.api.types.is_numeric_dtype(series):
+        return [_safe_round(value, digits) for value in series.tolist()]
+    values = np.round(series.to_numpy(dtype=float, na_value=np.nan), digits)
+    result: List[Optional[float]] = values.tolist()
+    for pos in np.flatnonzero(~np.isfinite(values)):
+        result[pos] = None
+    return result
+
+
+def _coalesce_columns(df: pd.DataFrame, columns: Sequence[str]) -> List[Any]:
+    """逐行取首个非空的列值（等价于 row.get(a) or row.get(b) or ...）。"""
+
+    merged = list(_column_values(df, columns[0]))
+    for column in columns[1:]:
+        merged = [current or extra for current, extra in zip(merged, _column_values(df, column))]
+    return merged
+
+
 def _convert_industry_rows(
     rows: Optional[pd.DataFrame],
     daily_df: Optional[pd.DataFrame],
@@ -348,10 +975,11 @@ def _convert_industry_rows(
         return []
     if daily_df is None or daily_df.empty or stock_basic is None or stock_basic.empty:
         payload = []
-        for _, row in rows.iterrows():
-            name = row.get("industry")
-            change = _safe_round(row.get("change_pct"))
-            amount = _safe_round(row.get("amount"), digits=6)
+        for name, change, amount in zip(
+            _column_values(rows, "industry"),
+            _rounded_values(rows, "change_pct"),
+            _rounded_values(rows, "amount", digits=6),
+        ):
             payload.append(
                 {
                     "name": name,
@@ -362,28 +990,37 @@ def _convert_industry_rows(
             )
         return payload
 
+    industries = _column_values(rows, "industry")
+    # 所有行业的龙头一次合并、分组选出，替代逐行业 merge
+    leaders_map = select_leaders_by_industry(
+        industries,
+        daily_df,
+        stock_basic,
+        ascending=not top,
+        limit=leader_limit,
+    )
     items: List[Dict[str, Any]] = []
-    for _, row in rows.iterrows():
-        industry = row.get("industry")
+    for industry, change, amount in zip(
+        industries,
+        _rounded_values(rows, "change_pct"),
+        _rounded_values(rows, "amount", digits=6),
+    ):
         if not industry:
             continue
-        change = _safe_round(row.get("change_pct")) or 0.0
-        amount = _safe_round(row.get("amount"), digits=6)
-        leaders_df = select_leaders(
-            industry,
-            daily_df,
-            stock_basic,
-            ascending=not top,
-            limit=leader_limit,
-        )
+        change = change or 0.0
+        leaders_df = leaders_map.get(industry)
         leaders: List[Dict[str, Any]] = []
         if leaders_df is not None and not leaders_df.empty:
-            for _, leader in leaders_df.iterrows():
+            for code, name, pct in zip(
+                _column_values(leaders_df, "ts_code"),
+                _column_values(leaders_df, "name"),
+                _rounded_values(leaders_df, "pct_chg"),
+            ):
                 leaders.append(
                     {
-                        "code": leader.get("ts_code"),
-                        "name": leader.get("name"),
-                        "change_pct": _safe_round(leader.get("pct_chg")),
+                        "code": code,
+                        "name": name,
+                        "change_pct": pct,
                     }
                 )
         items.append(
@@ -397,14 +1034,77 @@ def _convert_industry_rows(
     return items
 
 
+# 涨跌停判定阈值（涨跌幅绝对值，百分比）
+_BREADTH_LIMIT_PCT = 9.7
+
+
+@njit(cache=True, nogil=True)
+def _breadth_counts_kernel(values):  # pragma: no cover - numba 编译
+    advance = 0
+    decline = 0
+    limit_up = 0
+    limit_down = 0
+    for i in range(values.shape[0]):
+        x = values[i]
+        # NaN 的比较均为 False，按平盘处理
+        if x > 0:
+            advance += 1
+            if x >= _BREADTH_LIMIT_PCT:
+                limit_up += 1
+        elif x < 0:
+            decline += 1
+            if x <= -_BREADTH_LIMIT_PCT:
+                limit_down += 1
+    return advance, decline, limit_up, limit_down
+
+
+def _count_breadth(pct_chg: Any) -> Dict[str, int]:
+    """统计涨跌家数与涨跌停家数：有 numba 时单次循环计数，否则一次 bincount。"""
+
+    pct = pd.to_numeric(pct_chg, errors="coerce")
+    values = np.atleast_1d(np.asarray(pct, dtype=np.float64))
+    if NUMBA_AVAILABLE:
+        advance, decline, limit_up, limit_down = _breadth_counts_kernel(np.ascontiguousarray(values))
+        return {
+            "advance": int(advance),
+            "decline": int(decline),
+            "limit_up": int(limit_up),
+            "limit_down": int(limit_down),
+        }
+
+    # nan_to_num 返回副本，后续可原地改写；保留 float64 以免 ±9.7 阈值附近因精度误判
+    arr = np.nan_to_num(values, nan=0.0)
+    limit = np.abs(arr) >= _BREADTH_LIMIT_PCT
+    # 编码：0=下跌 1=平盘 2=上涨，涨跌停在此基础上 +3（跌停 3，涨停 5）
+    np.sign(arr, out=arr)
+    codes = arr.astype(np.int8)
+    codes += 1
+    np.add(codes, 3, out=codes, where=limit)
+    counts = np.bincount(codes, minlength=6)
+    return {
+        "advance": int(counts[2] + counts[5]),
+        "decline": int(counts[0] + counts[3]),
+        "limit_up": int(counts[5]),
+        "limit_down": int(counts[3]),
+    }
+
+
+@_single_flight
 async def get_market_breadth(
     ttl_seconds: int = 900,
 ) -> Dict[str, Any]:
-    """统计市场宽度信息（涨跌家数、涨停跌停等）。"""
+    """统计市场宽度信息（涨跌家数、涨停跌停等）。
 
-    global _BREADTH_CACHE
-    if _BREADTH_CACHE and time.time() - _BREADTH_CACHE.timestamp < ttl_seconds:
-        return _BREADTH_CACHE.payload
+    缓存按交易日区分：已收盘的历史交易日数据不会再变化，保留一天。
+    """
+
+    trade_date = await _trade_date()
+    if not trade_date:
+        trade_date = datetime.now().strftime("%Y%m%d")
+
+    cached = _get_from_cache(_BREADTH_CACHE, trade_date, ttl_seconds)
+    if cached is not None:
+        return cached
 
     breadth = {
         "advance": None,
@@ -413,44 +1113,77 @@ async def get_market_breadth(
         "limit_down": None,
     }
 
-    trade_date = await asyncio.to_thread(get_latest_trade_date)
-    if not trade_date:
-        trade_date = datetime.now().strftime("%Y%m%d")
-
-    daily_df = await asyncio.to_thread(_get_daily_snapshot, trade_date)
+    daily_df = await _to_io(_get_daily_snapshot, trade_date)
     if (daily_df is None or daily_df.empty) and trade_date:
         # 尝试回退上一交易日
-        prev_trade_date = await asyncio.to_thread(get_latest_trade_date, 1)
+        prev_trade_date = await _trade_date(1)
         if prev_trade_date:
-            daily_df = await asyncio.to_thread(_get_daily_snapshot, prev_trade_date)
+            daily_df = await _to_io(_get_daily_snapshot, prev_trade_date)
 
+    entry_ttl: Optional[float] = None
     if daily_df is not None and not daily_df.empty:
-        pct_series = pd.to_numeric(daily_df.get("pct_chg"), errors="coerce")
-        breadth["advance"] = int((pct_series > 0).sum())
-        breadth["decline"] = int((pct_series < 0).sum())
-        breadth["limit_up"] = int((pct_series >= 9.7).sum())
-        breadth["limit_down"] = int((pct_series <= -9.7).sum())
+        # 计数在 I/O 线程池执行：首次调用可能触发 numba 编译，不阻塞事件循环
+        breadth.update(await _to_io(_count_breadth, daily_df.get("pct_chg")))
+        if trade_date < _cn_today():
+            entry_ttl = 86400
     else:
         logger.info("未从 Tushare 获取到有效的日行情数据，市场宽度为空。")
 
-    _BREADTH_CACHE = _CacheEntry(payload=breadth, timestamp=time.time())
+    _BREADTH_CACHE[trade_date] = _CacheEntry(payload=breadth, timestamp=time.monotonic(), ttl=entry_ttl)
     return breadth
 
 
+def _snapshot_default(obj: Any) -> Any:
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+
+def _dumps_snapshot(payload: Dict[str, Any]) -> bytes:
+    """宏观快照编码：优先 msgpack（体积更小、解码更快），其次 orjson / json。"""
+
+    if msgpack is not None:
+        return msgpack.packb(payload, use_bin_type=True, default=_snapshot_default)
+    if orjson is not None:
+        return orjson.dumps(
+            payload,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    return json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _loads_snapshot(raw: bytes) -> Dict[str, Any]:
+    if msgpack is not None:
+        return msgpack.unpackb(raw, raw=False)
+    return _json_loads(raw)
+
+
+def _json_loads(raw: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 async def get_macro_snapshot() -> Dict[str, Any]:
     """聚合宏观指数、板块与市场宽度为一体的概览。"""
 
     global _MACRO_CACHE
-    if _MACRO_CACHE and time.time() - _MACRO_CACHE.timestamp < MACRO_SNAPSHOT_TTL:
-        cached = _MACRO_CACHE.payload
-        if isinstance(cached, dict):
-            return deepcopy(cached)
-        return cached
-    redis_cached = cache_manager.load_json(_macro_cache_key())
-    if redis_cached is not None:
-        _MACRO_CACHE = _CacheEntry(payload=deepcopy(redis_cached), timestamp=time.time())
-        return redis_cached
+    if _MACRO_CACHE and _MACRO_CACHE.is_fresh(MACRO_SNAPSHOT_TTL):
+        # 缓存保存序列化后的字节，每次反序列化即得到独立副本
+        return _loads_snapshot(_MACRO_CACHE.payload)
+    # Redis / Mongo 客户端是同步的，放到 I/O 线程池，避免阻塞并发请求的事件循环
+    raw_cached = await _to_io(cache_manager.load_bytes, _macro_cache_key())
+    if raw_cached is not None:
+        try:
+            redis_cached = _loads_snapshot(raw_cached)
+        except ValueError as exc:
+            logger.debug("宏观快照缓存反序列化失败: %s", exc)
+        else:
+            _MACRO_CACHE = _CacheEntry(payload=raw_cached, timestamp=time.monotonic())
+            return redis_cached
 
+    # gather 会立即把各协程包装为任务并发调度，总耗时取决于最慢的一项
     indices, sectors, breadth, northbound, lhb, news = await asyncio.gather(
         get_index_snapshot(),
         get_sector_rankings(),
@@ -477,9 +1210,13 @@ async def get_macro_snapshot() -> Dict[str, Any]:
         "lhb": lhb,
         "news": news,
     }
-    payload = deepcopy(result)
-    _MACRO_CACHE = _CacheEntry(payload=payload, timestamp=time.time())
-    cache_manager.store_json(_macro_cache_key(), payload, MACRO_SNAPSHOT_TTL)
+    try:
+        payload = _dumps_snapshot(result)
+    except (TypeError, ValueError) as exc:
+        logger.warning("宏观快照序列化失败，跳过缓存: %s", exc)
+        return result
+    _MACRO_CACHE = _CacheEntry(payload=payload, timestamp=time.monotonic())
+    await _to_io(cache_manager.store_bytes, _macro_cache_key(), payload, MACRO_SNAPSHOT_TTL)
     return result
 
 
@@ -513,15 +1250,15 @@ def _fetch_global_index_from_tushare(code: str) -> Optional[pd.DataFrame]:
         return None
     if df is None or df.empty:
         return None
-    data = df.copy()
-    if "trade_date" not in data.columns:
+    if "trade_date" not in df.columns:
         return None
-    data["trade_date"] = pd.to_datetime(data["trade_date"], errors="coerce")
-    data = data.dropna(subset=["trade_date"])
+    # df 为本次请求新建的对象，直接原地整理，无需先整表复制
+    df["trade_date"] = pd.to_datetime(df["trade_date"], errors="coerce")
+    data = df.dropna(subset=["trade_date"])
     if data.empty:
         return None
-    data = data.sort_values("trade_date")
     data = data.set_index("trade_date")
+    data.sort_index(inplace=True)
     rename_map = {
         "close": "Close",
         "open": "Open",
@@ -532,18 +1269,34 @@ def _fetch_global_index_from_tushare(code: str) -> Optional[pd.DataFrame]:
     }
     available = {k: v for k, v in rename_map.items() if k in data.columns}
     if available:
-        data = data.rename(columns=available)
+        data.rename(columns=available, inplace=True)
     return data
 
 
 def _find_column(columns: Iterable[Any], keywords: Sequence[str]) -> Optional[Any]:
-    for col in columns:
-        label = str(col)
-        if any(keyword in label for keyword in keywords):
-            return col
+    cols = tuple(columns)
+    pos = _find_column_position(tuple(str(col) for col in cols), tuple(keywords))
+    return cols[pos] if pos is not None else None
+
+
+@functools.lru_cache(maxsize=256)
+def _find_column_position(labels: Tuple[str, ...], keywords: Tuple[str, ...]) -> Optional[int]:
+    # 同一接口返回的列结构基本固定，按 (列名, 关键字) 缓存匹配结果
+    if not keywords:
+        return None
+    pattern = _keyword_pattern(keywords)
+    for pos, label in enumerate(labels):
+        if pattern.search(label):
+            return pos
     return None
 
 
+@functools.lru_cache(maxsize=64)
+def _keyword_pattern(keywords: Tuple[str, ...]) -> "re.Pattern[str]":
+    # 多个关键字合并为一个正则，单次扫描即可判断列名是否包含任一关键字
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
 def _as_float(value: Any) -> Optional[float]:
     if value is None:
         return None
@@ -569,129 +1322,179 @@ def _safe_round(value: Any, digits: int = 3) -> Optional[float]:
     return round(num, digits)
 
 
+@_single_flight
 async def _get_northbound_flow(ttl_seconds: int = 1800) -> Optional[float]:
     global _NORTHBOUND_CACHE
-    if _NORTHBOUND_CACHE and time.time() - _NORTHBOUND_CACHE.timestamp < ttl_seconds:
+    if _NORTHBOUND_CACHE and _NORTHBOUND_CACHE.is_fresh(ttl_seconds):
         return _NORTHBOUND_CACHE.payload
 
-    trade_date = await asyncio.to_thread(get_latest_trade_date)
+    trade_date = await _trade_date()
     if trade_date:
         try:
-            df = await asyncio.to_thread(fetch_moneyflow_hsgt, trade_date)
+            df = await _to_io(fetch_moneyflow_hsgt, trade_date)
         except TushareUnavailable as exc:
             logger.info("Tushare 北向资金不可用：%s", exc)
         except Exception as exc:  # pragma: no cover
             logger.warning("获取北向资金数据失败: %s", exc)
         else:
             if df is not None and not df.empty:
-                df = df.copy()
                 if "north_money" in df.columns:
                     north_series = pd.to_numeric(df["north_money"], errors="coerce").dropna()
                     if not north_series.empty:
                         # north_money 单位：亿元
                         value = float(north_series.iloc[-1]) * 1e8
-                        _NORTHBOUND_CACHE = _CacheEntry(payload=value, timestamp=time.time())
+                        _NORTHBOUND_CACHE = _CacheEntry(payload=value, timestamp=time.monotonic())
                         return value
 
     try:
-        df = await asyncio.to_thread(fetch_northbound_intraday, "北向资金")
+        df = await _ak_call(fetch_northbound_intraday, "北向资金")
     except AkShareUnavailable:
         logger.info("未安装 AkShare，北向资金缺失。")
     except Exception as exc:  # pragma: no cover
         logger.warning("获取北向资金分时失败: %s", exc)
     else:
         if df is not None and not df.empty:
-            data = df.copy()
-            north_col = _find_column(data.columns, ["北向资金"])
+            north_col = _find_column(df.columns, ["北向资金"])
             if north_col is None:
-                north_col = _find_column(data.columns, ["净流入", "资金"])
+                north_col = _find_column(df.columns, ["净流入", "资金"])
             if north_col is not None:
-                series = pd.to_numeric(data[north_col], errors="coerce").dropna()
+                series = pd.to_numeric(df[north_col], errors="coerce").dropna()
                 if not series.empty:
                     value = float(series.iloc[-1]) * 1e4
-                    _NORTHBOUND_CACHE = _CacheEntry(payload=value, timestamp=time.time())
+                    _NORTHBOUND_CACHE = _CacheEntry(payload=value, timestamp=time.monotonic())
                     return value
 
-    _NORTHBOUND_CACHE = _CacheEntry(payload=None, timestamp=time.time())
+    _NORTHBOUND_CACHE = _CacheEntry(payload=None, timestamp=time.monotonic())
     return None
 
 
+@functools.lru_cache(maxsize=32)
+def _lhb_schema(columns: Tuple[Any, ...]) -> Dict[str, Any]:
+    """龙虎榜表的列映射，按列结构缓存（Tushare top_inst / top_list 的列固定）。"""
+
+    return {
+        "net": _find_column(columns, ["net_buy", "净买"]),
+        "buy": _find_column(columns, ["buy", "买入"]),
+        "sell": _find_column(columns, ["sell", "卖出"]),
+        "ts": _find_column(columns, ["ts_code", "代码"]),
+        "name": _find_column(columns, ["name", "名称"]),
+    }
+
+
+async def _fetch_lhb_frame(date: str, *, with_fallback: bool) -> Optional[pd.DataFrame]:
+    """拉取单日龙虎榜机构明细，必要时回退到龙虎榜列表；TushareUnavailable 向上抛出。"""
+
+    try:
+        df = await _to_io(fetch_top_inst, date)
+        if (df is None or df.empty) and with_fallback:
+            df = await _to_io(fetch_top_list, date)
+    except TushareUnavailable:
+        raise
+    except Exception:
+        return None
+    return df
+
+
+def _lhb_candidates(df: pd.DataFrame, date: str, limit: int) -> List[Dict[str, Any]]:
+    schema = _lhb_schema(tuple(df.columns))
+    net_col = schema["net"]
+    if net_col is not None:
+        # 只需净买入前 limit 名：nlargest 做部分选择（自动剔除 NaN），无需整表排序
+        net_series = pd.to_numeric(df[net_col], errors="coerce").reset_index(drop=True)
+        top_net = net_series.nlargest(limit)
+        data = df.iloc[top_net.index.to_numpy()]
+        net_values: Sequence[Any] = top_net.tolist()
+    else:
+        data = df.head(limit)
+        net_values = [None] * len(data)
+
+    candidates: List[Dict[str, Any]] = []
+    for net_raw, buy_raw, sell_raw, code, name in zip(
+        net_values,
+        _column_values(data, schema["buy"]),
+        _column_values(data, schema["sell"]),
+        _column_values(data, schema["ts"]),
+        _column_values(data, schema["name"]),
+    ):
+        net_value = _as_float(net_raw)
+        buy_value = _as_float(buy_raw)
+        sell_value = _as_float(sell_raw)
+        candidates.append(
+            {
+                "code": code,
+                "name": name,
+                "net_buy": (net_value * 1e4) if net_value is not None else None,
+                "buy_value": (buy_value * 1e4) if buy_value is not None else None,
+                "sell_value": (sell_value * 1e4) if sell_value is not None else None,
+                "date": date,
+            }
+        )
+    return candidates
+
+
+@_single_flight
 async def _get_lhb_summary(ttl_seconds: int = 3600, limit: int = 5) -> List[Dict[str, Any]]:
     global _LHB_CACHE
-    if _LHB_CACHE and time.time() - _LHB_CACHE.timestamp < ttl_seconds:
+    if _LHB_CACHE and _LHB_CACHE.is_fresh(ttl_seconds):
         return _LHB_CACHE.payload
 
-    trade_date = await asyncio.to_thread(get_latest_trade_date)
+    trade_date = await _trade_date()
     candidates: List[Dict[str, Any]] = []
 
     if trade_date:
-        for offset in range(5):
-            date_obj = datetime.strptime(trade_date, "%Y%m%d") - timedelta(days=offset)
-            date = date_obj.strftime("%Y%m%d")
-            try:
-                df = await asyncio.to_thread(fetch_top_inst, date)
-                if (df is None or df.empty) and offset == 0:
-                    df = await asyncio.to_thread(fetch_top_list, date)
-            except TushareUnavailable as exc:
-                logger.info("Tushare 龙虎榜不可用：%s", exc)
-                break
-            except Exception:
-                continue
-
-            if df is None or df.empty:
-                continue
-
-            data = df.copy()
-            net_col = _find_column(data.columns, ["net_buy", "净买"])
-            buy_col = _find_column(data.columns, ["buy", "买入"])
-            sell_col = _find_column(data.columns, ["sell", "卖出"])
-            ts_col = _find_column(data.columns, ["ts_code", "代码"])
-            name_col = _find_column(data.columns, ["name", "名称"])
-
-            if net_col:
-                data[net_col] = pd.to_numeric(data[net_col], errors="coerce")
-                data = data.dropna(subset=[net_col])
-                data = data.sort_values(by=net_col, ascending=False)
-
-            for _, row in data.head(limit).iterrows():
-                net_value = _as_float(row.get(net_col))
-                buy_value = _as_float(row.get(buy_col))
-                sell_value = _as_float(row.get(sell_col))
-                candidates.append(
-                    {
-                        "code": row.get(ts_col),
-                        "name": row.get(name_col),
-                        "net_buy": (net_value * 1e4) if net_value is not None else None,
-                        "buy_value": (buy_value * 1e4) if buy_value is not None else None,
-                        "sell_value": (sell_value * 1e4) if sell_value is not None else None,
-                        "date": date,
-                    }
-                )
-            if candidates:
-                break
-
-    if not candidates and _LHB_CACHE:
+        base = datetime.strptime(trade_date, "%Y%m%d")
+        dates = [(base - timedelta(days=offset)).strftime("%Y%m%d") for offset in range(5)]
+        # 近 5 个自然日并发探测，按日期由近到远取第一个有数据的结果，其余请求随即取消
+        tasks = [
+            asyncio.ensure_future(_fetch_lhb_frame(date, with_fallback=offset == 0))
+            for offset, date in enumerate(dates)
+        ]
+        try:
+            for date, task in zip(dates, tasks):
+                try:
+                    df = await task
+                except TushareUnavailable as exc:
+                    logger.info("Tushare 龙虎榜不可用：%s", exc)
+                    break
+                if df is None or df.empty:
+                    continue
+                candidates = _lhb_candidates(df, date, limit)
+                if candidates:
+                    break
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # 已完成但未被等待的任务，标记异常已读取
+
+    entry_ttl: Optional[float] = None
+    if candidates:
+        # 龙虎榜盘后发布，拿到数据后到下一次开盘前都不会变化
+        entry_ttl = max(ttl_seconds, _seconds_until_next_session_open())
+    elif _LHB_CACHE:
         candidates = _LHB_CACHE.payload
 
-    _LHB_CACHE = _CacheEntry(payload=candidates, timestamp=time.time())
+    _LHB_CACHE = _CacheEntry(payload=candidates, timestamp=time.monotonic(), ttl=entry_ttl)
     return candidates
 
 
+@_single_flight
 async def _get_news_highlights(ttl_seconds: int = 1800, limit: int = 5) -> List[Dict[str, Any]]:
     global _NEWS_CACHE
-    if _NEWS_CACHE and time.time() - _NEWS_CACHE.timestamp < ttl_seconds:
+    if _NEWS_CACHE and _NEWS_CACHE.is_fresh(ttl_seconds):
         return _NEWS_CACHE.payload
 
     news_list: List[Dict[str, Any]] = []
-    trade_date = await asyncio.to_thread(get_latest_trade_date)
+    trade_date = await _trade_date()
     if not trade_date:
         trade_date = datetime.now().strftime("%Y%m%d")
 
     try:
-        df = await asyncio.to_thread(fetch_tushare_news, trade_date, trade_date)
+        df = await _to_io(fetch_tushare_news, trade_date, trade_date)
         if (df is None or df.empty) and trade_date:
             # 补充当天滚动新闻
-            df = await asyncio.to_thread(fetch_tushare_news, trade_date, datetime.now().strftime("%Y%m%d"))
+            df = await _to_io(fetch_tushare_news, trade_date, datetime.now().strftime("%Y%m%d"))
     except TushareUnavailable as exc:
         logger.info("Tushare 新闻接口不可用：%s", exc)
         df = None
@@ -700,81 +1503,110 @@ async def _get_news_highlights(ttl_seconds: int = 1800, limit: int = 5) -> List[
         df = None
 
     if df is not None and not df.empty:
-        data = df.head(limit).copy()
-        for _, row in data.iterrows():
-            title = row.get("title")
+        data = df.head(limit)
+        for title, summary, published, source, url in zip(
+            _column_values(data, "title"),
+            _coalesce_columns(data, ("summary", "abstract", "content")),
+            _coalesce_columns(data, ("datetime", "time", "pub_time")),
+            _coalesce_columns(data, ("source", "media")),
+            _column_values(data, "url"),
+        ):
             if not title:
                 continue
             news_list.append(
                 {
                     "title": title,
-                    "summary": row.get("summary") or row.get("abstract") or row.get("content"),
-                    "time": row.get("datetime") or row.get("time") or row.get("pub_time"),
-                    "source": row.get("source") or row.get("media"),
-                    "url": row.get("url"),
+                    "summary": summary,
+                    "time": published,
+                    "source": source,
+                    "url": url,
                 }
             )
 
     if not news_list and _NEWS_CACHE:
         news_list = _NEWS_CACHE.payload
 
-    _NEWS_CACHE = _CacheEntry(payload=news_list, timestamp=time.time())
+    _NEWS_CACHE = _CacheEntry(payload=news_list, timestamp=time.monotonic())
     return news_list
 
 
-def _fetch_index_from_finnhub(symbol: str) -> Optional[pd.DataFrame]:
+_FINNHUB_CANDLE_URL = "https://finnhub.io/api/v1/index/candle"
+
+
+def _finnhub_params(symbol: str, api_key: str) -> Dict[str, Any]:
+    end_ts = int(time.time())
+    return {
+        "symbol": symbol,
+        "resolution": "D",
+        "from": end_ts - 3600 * 24 * 10,
+        "to": end_ts,
+        "token": api_key,
+    }
+
+
+def _fetch_index_from_finnhub(symbol: str) -> Optional[_IndexSlice]:
     api_key = os.getenv("FINNHUB_API_KEY")
     if not api_key or requests is None:
         return None
 
-    end_ts = int(time.time())
-    start_ts = end_ts - 3600 * 24 * 10
     try:
-        resp = requests.get(
-            "https://finnhub.io/api/v1/index/candle",
-            params={
-                "symbol": symbol,
-                "resolution": "D",
-                "from": start_ts,
-                "to": end_ts,
-                "token": api_key,
-            },
-            timeout=10,
-        )
+        resp = _HTTP.get(_FINNHUB_CANDLE_URL, params=_finnhub_params(symbol, api_key), timeout=10)
+        if resp.status_code != 200:
+            logger.warning("Finnhub 指数请求失败 %s: %s", symbol, resp.text)
+            return None
+        data = _json_loads(resp.content)
+    except Exception as exc:  # pragma: no cover
+        logger.warning("Finnhub 指数请求异常 %s: %s", symbol, exc)
+        return None
+    return _parse_finnhub_candles(symbol, data)
+
+
+async def _fetch_index_from_finnhub_async(symbol: str) -> Optional[_IndexSlice]:
+    """httpx 原生异步版本，直接在事件循环上复用连接，不占用 I/O 线程。"""
+
+    api_key = os.getenv("FINNHUB_API_KEY")
+    if not api_key:
+        return None
+
+    try:
+        resp = await _httpx_client().get(_FINNHUB_CANDLE_URL, params=_finnhub_params(symbol, api_key))
         if resp.status_code != 200:
             logger.warning("Finnhub 指数请求失败 %s: %s", symbol, resp.text)
             return None
-        data = resp.json()
+        data = _json_loads(resp.content)
     except Exception as exc:  # pragma: no cover
         logger.warning("Finnhub 指数请求异常 %s: %s", symbol, exc)
         return None
+    return _parse_finnhub_candles(symbol, data)
 
-    if data.get("s") != "ok":
+
+def _parse_finnhub_candles(symbol: str, data: Any) -> Optional[_IndexSlice]:
+    if not isinstance(data, dict) or data.get("s") != "ok":
         return None
 
     timestamps = data.get("t", [])
     if not timestamps:
         return None
 
-    df = pd.DataFrame(
-        {
-            "Datetime": pd.to_datetime(timestamps, unit="s", utc=True),
-            "Open": data.get("o", []),
-            "High": data.get("h", []),
-            "Low": data.get("l", []),
-            "Close": data.get("c", []),
-            "Volume": data.get("v", []),
-        }
-    )
-    df.set_index("Datetime", inplace=True)
-    df.sort_index(inplace=True)
-    numeric_cols = ["Open", "High", "Low", "Close", "Volume"]
-    df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
-    df = df.loc[:, ~df.columns.duplicated()]
-    return df.tail(10)
+    try:
+        ts = np.asarray(timestamps, dtype=np.int64)
+        close = np.asarray(data.get("c", []), dtype=np.float64)
+        volume = np.asarray(data.get("v", []), dtype=np.float64)
+    except (TypeError, ValueError) as exc:
+        logger.warning("Finnhub 指数数据格式异常 %s: %s", symbol, exc)
+        return None
+    if close.shape != ts.shape or (volume.size and volume.shape != ts.shape):
+        logger.warning("Finnhub 指数数据长度不一致 %s", symbol)
+        return None
+    # 只需最近两根 K 线的收盘价与成交量，按时间排序后直接切片，不再构造 DataFrame
+    if ts.size > 1 and np.any(ts[1:] < ts[:-1]):
+        order = np.argsort(ts, kind="stable")
+        close = close[order]
+        volume = volume[order] if volume.size else volume
+    return _IndexSlice(close=close[-2:], volume=volume[-2:])
 
 
-def _fetch_index_from_tushare(ts_code: str) -> Optional[pd.DataFrame]:
+def _fetch_index_from_tushare(ts_code: str) -> Optional[_IndexSlice]:
     try:
         end_date = datetime.now().strftime("%Y%m%d")
         start_date = (datetime.now() - pd.Timedelta(days=20)).strftime("%Y%m%d")
@@ -786,12 +1618,11 @@ def _fetch_index_from_tushare(ts_code: str) -> Optional[pd.DataFrame]:
         return None
     if df is None or df.empty:
         return None
-    data = df.copy()
-    if not isinstance(data.index, pd.DatetimeIndex):
-        data.index = pd.to_datetime(data.index)
-    try:
-        data.index = data.index.tz_localize("Asia/Shanghai", nonexistent="shift_forward", ambiguous="NaT").tz_convert("UTC")
-    except TypeError:
-        data.index = data.index.tz_convert("UTC")
-    data = data.loc[:, ~data.columns.duplicated()]
-    return data.tail(20)
+    if df.columns.has_duplicates:
+        df = df.loc[:, ~df.columns.duplicated()]
+    if "Close" not in df.columns:
+        return None
+    # fetch_index_daily 已按交易日升序排列，只取最近两日的收盘价与成交量
+    recent = df.tail(2)
+    volume = _fast_numeric(recent["Volume"]) if "Volume" in recent.columns else np.array([])
+    return _IndexSlice(close=_fast_numeric(recent["Close"]), volume=volume)
@@ -8,14 +8,26 @@
 from __future__ import annotations
 
 import abc
+import functools
 import logging
 import os
-from datetime import datetime
-from typing import Dict, Iterable, Optional
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from zoneinfo import ZoneInfo
 
 import pandas as pd
 import yfinance as yf
 
+try:  # pragma: no cover - 可选依赖
+    import yfinance_cache as yfc  # type: ignore
+except ImportError:  # pragma: no cover
+    yfc = None  # type: ignore
+
 from .akshare_api import (
     AkShareUnavailable,
     fetch_a_stock_daily,
@@ -31,43 +43,52 @@ from .tushare_api import (
 
 logger = logging.getLogger(__name__)
 
+# A 股行情的本地时区，模块加载时解析一次，供 K 线时间戳本地化复用
+_SH_TZ = ZoneInfo("Asia/Shanghai")
+
+
+# 代码格式解析：单次正则匹配 + 查表，替代逐个 startswith/split 分支；结果按代码缓存
+_YF_SYMBOL_RE = re.compile(r"(?:([^.]*)\.(.*)|(SH|SZ|BJ).*(.{6})|(\d{6}))", re.S)
+_YF_SUFFIXES = {"SS": "SS", "SH": "SS", "SZ": "SZ", "BJ": "BJ", "HK": "HK"}
+_YF_PREFIX_SUFFIXES = {"SH": "SS", "SZ": "SZ", "BJ": "BJ"}
+_YF_DIGIT_SUFFIXES = {"5": "SS", "6": "SS", "9": "SS", "0": "SZ", "2": "SZ", "3": "SZ", "4": "BJ", "8": "BJ"}
 
+_AK_SYMBOL_RE = re.compile(r"(?:(?:sh|sz|bj).*|([^.]*)\.(ss|sh|sz|bj)|(\d{6}))", re.S)
+_AK_SUFFIX_PREFIXES = {"ss": "sh", "sh": "sh", "sz": "sz", "bj": "bj"}
+_AK_DIGIT_PREFIXES = {"5": "sh", "6": "sh", "9": "sh"}
+
+
+@functools.lru_cache(maxsize=4096)
 def normalize_yfinance_symbol(ticker: str) -> str:
     """将常见 A 股/港股代码转换为 yfinance 可识别的格式。"""
     if not ticker:
         return ticker
-    symbol = ticker.strip()
-    upper = symbol.upper()
-
-    if "." in upper:
-        base, suffix = upper.split(".", 1)
-        suffix = suffix.upper()
-        if suffix in {"SS", "SH"}:
-            return f"{base}.SS"
-        if suffix in {"SZ"}:
-            return f"{base}.SZ"
-        if suffix in {"BJ"}:
-            return f"{base}.BJ"
-        if suffix in {"HK"}:
-            return f"{base}.HK"
+    upper = ticker.strip().upper()
+    match = _YF_SYMBOL_RE.fullmatch(upper)
+    if match is None:
         return upper
-
-    if upper.startswith("SH") and len(upper) >= 8:
-        return f"{upper[-6:]}.SS"
-    if upper.startswith("SZ") and len(upper) >= 8:
-        return f"{upper[-6:]}.SZ"
-    if upper.startswith("BJ") and len(upper) >= 8:
-        return f"{upper[-6:]}.BJ"
-
-    if len(upper) == 6 and upper.isdigit():
-        prefix = upper[0]
-        if prefix in {"6", "9", "5"}:
-            return f"{upper}.SS"
-        if prefix in {"0", "2", "3"}:
-            return f"{upper}.SZ"
-        if prefix in {"4", "8"}:
-            return f"{upper}.BJ"
-    return upper
+    base, suffix, prefix, prefixed_digits, digits = match.groups()
+    if suffix is not None:
+        mapped = _YF_SUFFIXES.get(suffix)
+        return f"{base}.{mapped}" if mapped else upper
+    if prefix is not None:
+        return f"{prefixed_digits}.{_YF_PREFIX_SUFFIXES[prefix]}"
+    mapped = _YF_DIGIT_SUFFIXES.get(digits[0])
+    return f"{digits}.{mapped}" if mapped else upper
+
+
+@functools.lru_cache(maxsize=4096)
+def _akshare_symbol(ticker: str) -> str:
+    symbol = ticker.lower()
+    match = _AK_SYMBOL_RE.fullmatch(symbol)
+    if match is None:
+        raise ProviderError("AkShare 仅支持 A 股代码，例如 sh600519 或 600519。")
+    base, suffix, digits = match.groups()
+    if suffix is not None:
+        return f"{_AK_SUFFIX_PREFIXES[suffix]}{base}"
+    if digits is not None:
+        return f"{_AK_DIGIT_PREFIXES.get(digits[0], 'sz')}{digits}"
+    return symbol
 
 
 class ProviderError(RuntimeError):
@@ -94,6 +115,121 @@ class CandleProvider(abc.ABC):
         """抓取指定区间的 K 线数据。"""
 
 
+class _FrameMemo:
+    """进程内 DataFrame 短期记忆：TTL 内复用同一 key 的结果，超出容量按 LRU 淘汰。
+
+    缓存的 DataFrame 与调用方共享，调用方不得原地修改。
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._items: "OrderedDict[Tuple[Any, ...], Tuple[float, pd.DataFrame]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Tuple[Any, ...], ttl: float) -> Optional[pd.DataFrame]:
+        with self._lock:
+            hit = self._items.get(key)
+            if hit is None or time.monotonic() - hit[0] >= ttl:
+                return None
+            self._items.move_to_end(key)
+            return hit[1]
+
+    def put(self, key: Tuple[Any, ...], df: Optional[pd.DataFrame]) -> None:
+        if df is None or df.empty:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic(), df)
+            self._items.move_to_end(key)
+            while len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+
+
+# 进程内 yfinance 下载结果的短期记忆：同一轮运行中重复请求同一标的、同一区间时
+# 直接复用，避免重复的 HTTPS 往返与 Yahoo 限流压力
+_YF_MEMO_TTL = float(os.getenv("YF_MEMO_TTL", "60"))
+_YF_MEMO = _FrameMemo(maxsize=128)
+
+
+def _cached_yf_download(symbol: str, **kwargs: Any) -> Optional[pd.DataFrame]:
+    """带 TTL 的 yf.download；返回的 DataFrame 与缓存共享，调用方不得原地修改。"""
+
+    if _YF_MEMO_TTL <= 0:
+        return yf.download(symbol, **kwargs)
+    key = (symbol, kwargs.get("interval"), kwargs.get("start"), kwargs.get("end"))
+    df = _YF_MEMO.get(key, _YF_MEMO_TTL)
+    if df is None:
+        df = yf.download(symbol, **kwargs)
+        _YF_MEMO.put(key, df)
+    return df
+
+
+# AkShare 每次返回完整历史，由提供方在本地按 start/end 截取；按 (接口, 代码, 周期)
+# 缓存原始结果，重复扫描时只做内存切片。日线与分钟线分别设置 TTL（秒，<=0 关闭）
+_AK_MEMO_TTL_DAILY = float(os.getenv("AK_MEMO_TTL_DAILY", "600"))
+_AK_MEMO_TTL_MINUTE = float(os.getenv("AK_MEMO_TTL_MINUTE", "60"))
+_AK_MEMO = _FrameMemo(maxsize=256)
+
+
+def _cached_ak_fetch(func: Callable[..., pd.DataFrame], *args: Any, ttl: float) -> pd.DataFrame:
+    """带 TTL 的 AkShare 拉取；返回的 DataFrame 与缓存共享，调用方不得原地修改。"""
+
+    if ttl <= 0:
+        return func(*args)
+    key = (func.__name__, *args)
+    df = _AK_MEMO.get(key, ttl)
+    if df is None:
+        df = func(*args)
+        _AK_MEMO.put(key, df)
+    return df
+
+
+# 设置 STOCKAI_USE_YFCACHE=1 且安装了 yfinance-cache 时，K 线改走其增量缓存：
+# 本地已有的历史 K 线不再重复下载，只补拉新增部分
+_USE_YFCACHE = yfc is not None and os.getenv("STOCKAI_USE_YFCACHE") == "1"
+_OHLCV_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+def _yfc_history(
+    symbol: str,
+    interval: str,
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> Optional[pd.DataFrame]:
+    """通过 yfinance-cache 拉取未复权 K 线；失败时返回 None，由调用方回退 yf.download。"""
+
+    kwargs: Dict[str, Any] = {"interval": interval, "adjust_divs": False}
+    if start or end:
+        kwargs["start"] = start
+        kwargs["end"] = end
+    else:
+        kwargs["period"] = "1mo"  # 与 yf.download 未指定区间时的默认值一致
+    try:
+        df = yfc.Ticker(symbol).history(**kwargs)
+    except Exception as exc:  # pragma: no cover - 第三方缓存异常
+        logger.warning("yfinance-cache 拉取 %s 失败，回退 yf.download：%s", symbol, exc)
+        return None
+    if df is None or df.empty:
+        return None
+    # yfinance-cache 会附带缓存元数据列，仅保留 OHLCV
+    return df.loc[:, [col for col in _OHLCV_COLUMNS if col in df.columns]]
+
+
+def _slice_by_date(
+    df: pd.DataFrame,
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> pd.DataFrame:
+    """按 [start, end] 截取有序时间索引：二分定位后切片，避免逐行布尔掩码。"""
+    if not start and not end:
+        return df
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    index = df.index
+    lo = index.searchsorted(start, side="left") if start else 0
+    hi = index.searchsorted(end, side="right") if end else len(index)
+    return df.iloc[lo:hi]
+
+
 class YFinanceProvider(CandleProvider):
     """yfinance 提供的免费行情源。"""
 
@@ -122,7 +258,10 @@ class YFinanceProvider(CandleProvider):
 
         symbol = normalize_yfinance_symbol(ticker)
         logger.info("使用 yfinance 拉取 %s/%s", symbol, interval)
-        df = yf.download(symbol, **kwargs)
+        df = _yfc_history(symbol, interval, start, end) if _USE_YFCACHE else None
+        if df is None:
+            # fetcher 会先复制再规整，这里可直接返回共享的缓存结果
+            df = _cached_yf_download(symbol, **kwargs)
         if df is None:
             return pd.DataFrame()
         return df
@@ -132,16 +271,18 @@ class TushareProvider(CandleProvider):
     """Tushare Pro 行情源，覆盖 A 股日线与分钟级数据。"""
 
     name = "tushare"
-    _FREQ_MAP = {
-        "1m": "1min",
-        "5m": "5min",
-        "15m": "15min",
-        "30m": "30min",
-        "60m": "60min",
-        "1h": "60min",
-        "1d": "D",
-    }
-    _SUPPORTED = set(_FREQ_MAP.keys())
+    _FREQ_MAP = MappingProxyType(
+        {
+            "1m": "1min",
+            "5m": "5min",
+            "15m": "15min",
+            "30m": "30min",
+            "60m": "60min",
+            "1h": "60min",
+            "1d": "D",
+        }
+    )
+    _SUPPORTED = frozenset(_FREQ_MAP)
 
     def __init__(self) -> None:
         try:
@@ -173,18 +314,15 @@ class TushareProvider(CandleProvider):
         if df.empty:
             raise ProviderError("Tushare 返回的数据为空。")
 
-        if start:
-            df = df[df.index >= start]
-        if end:
-            df = df[df.index <= end]
+        df = _slice_by_date(df, start, end)
 
         if df.empty:
             raise ProviderError("Tushare 数据为空。")
 
         try:
-            df.index = df.index.tz_localize("Asia/Shanghai", nonexistent="shift_forward", ambiguous="NaT").tz_convert("UTC")
+            df.index = df.index.tz_localize(_SH_TZ, nonexistent="shift_forward", ambiguous="NaT").tz_convert(timezone.utc)
         except TypeError:
-            df.index = df.index.tz_convert("UTC")
+            df.index = df.index.tz_convert(timezone.utc)
 
         columns = ["Open", "High", "Low", "Close", "Volume"]
         existing = [col for col in columns if col in df.columns]
@@ -206,8 +344,8 @@ class AkShareProvider(CandleProvider):
     """AkShare 免费行情数据，适合 A 股日内与日线。"""
 
     name = "akshare"
-    _MINUTE_MAP = {"1m": "1min", "5m": "5min", "15m": "15min", "30m": "30min", "1h": "60min"}
-    _SUPPORTED = set(_MINUTE_MAP.keys()) | {"1d"}
+    _MINUTE_MAP = MappingProxyType({"1m": "1min", "5m": "5min", "15m": "15min", "30m": "30min", "1h": "60min"})
+    _SUPPORTED = frozenset(_MINUTE_MAP) | {"1d"}
 
     def __init__(self) -> None:
         if not akshare_is_available():
@@ -226,10 +364,10 @@ class AkShareProvider(CandleProvider):
         symbol = self._transform_symbol(ticker)
         try:
             if interval == "1d":
-                df = fetch_a_stock_daily(symbol)
+                df = _cached_ak_fetch(fetch_a_stock_daily, symbol, ttl=_AK_MEMO_TTL_DAILY)
             else:
                 period = self._MINUTE_MAP[interval]
-                df = fetch_a_stock_minute(symbol, period)
+                df = _cached_ak_fetch(fetch_a_stock_minute, symbol, period, ttl=_AK_MEMO_TTL_MINUTE)
         except AkShareUnavailable as exc:
             raise ProviderError(str(exc)) from exc
         except Exception as exc:
@@ -238,10 +376,7 @@ class AkShareProvider(CandleProvider):
         if df is None or df.empty:
             raise ProviderError("AkShare 返回的数据为空。")
 
-        if start:
-            df = df[df.index >= start]
-        if end:
-            df = df[df.index <= end]
+        df = _slice_by_date(df, start, end)
 
         if df.empty:
             raise ProviderError("AkShare 数据为空。")
@@ -249,23 +384,7 @@ class AkShareProvider(CandleProvider):
 
     @staticmethod
     def _transform_symbol(ticker: str) -> str:
-        symbol = ticker.lower()
-        if symbol.startswith(("sh", "sz", "bj")):
-            return symbol
-        if "." in symbol:
-            base, suffix = symbol.split(".", 1)
-            suffix = suffix.lower()
-            if suffix in {"ss", "sh"}:
-                return f"sh{base}"
-            if suffix in {"sz"}:
-                return f"sz{base}"
-            if suffix in {"bj"}:
-                return f"bj{base}"
-        if len(symbol) == 6 and symbol.isdigit():
-            if symbol.startswith(("5", "6", "9")):
-                return f"sh{symbol}"
-            return f"sz{symbol}"
-        raise ProviderError("AkShare 仅支持 A 股代码，例如 sh600519 或 600519。")
+        return _akshare_symbol(ticker)
 
 
 def load_akshare_provider() -> Optional[AkShareProvider]:
@@ -283,7 +402,7 @@ class AkShareUSProvider(CandleProvider):
     """AkShare 美股行情数据，作为 yfinance 的备用。"""
 
     name = "akshare_us"
-    _SUPPORTED = {"1d"}
+    _SUPPORTED = frozenset({"1d"})
 
     def __init__(self) -> None:
         if not akshare_is_available():
@@ -302,7 +421,7 @@ class AkShareUSProvider(CandleProvider):
         symbol = ticker.upper()
         logger.info("使用 AkShare US 拉取 %s/%s", symbol, interval)
         try:
-            df = fetch_us_stock_daily(symbol)
+            df = _cached_ak_fetch(fetch_us_stock_daily, symbol, ttl=_AK_MEMO_TTL_DAILY)
         except AkShareUnavailable as exc:
             raise ProviderError(str(exc)) from exc
         except Exception as exc:
@@ -311,10 +430,7 @@ class AkShareUSProvider(CandleProvider):
         if df is None or df.empty:
             raise ProviderError("AkShare US 未返回日线数据。")
 
-        if start:
-            df = df[df.index >= start]
-        if end:
-            df = df[df.index <= end]
+        df = _slice_by_date(df, start, end)
 
         if df.empty:
             raise ProviderError("AkShare US 数据为空。")
@@ -333,7 +449,20 @@ def load_akshare_us_provider() -> Optional[AkShareUSProvider]:
 
 
 def default_providers() -> Iterable[CandleProvider]:
-    """返回默认启用的提供方列表，按优先级排序。"""
+    """返回默认启用的提供方列表，按优先级排序。
+
+    提供方在进程内只探测、构造一次；环境变量变更后可调用 invalidate_providers_cache 重建。
+    """
+    return _default_providers_cached()
+
+
+def invalidate_providers_cache() -> None:
+    """清空默认提供方缓存，下次调用 default_providers 时重新探测。"""
+    _default_providers_cached.cache_clear()
+
+
+@functools.lru_cache(maxsize=1)
+def _default_providers_cached() -> Tuple[CandleProvider, ...]:
     providers: list[CandleProvider] = []
     tushare = load_tushare_provider()
     if tushare is not None:
@@ -345,4 +474,4 @@ def default_providers() -> Iterable[CandleProvider]:
     if akshare_us is not None:
         providers.append(akshare_us)
     providers.append(YFinanceProvider())
-    return providers
+    return tuple(providers)
@@ -11,7 +11,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 from .fetcher import get_candles_batch
-from .indicators import compute_all
+from .indicators import compute_all_batch
 from .watchlist import Watchlist, load_watchlist
 from engine.analyzer import analyze_snapshot
 from engine.opportunity_filter import is_candidate
@@ -49,44 +49,17 @@ async def scan_opportunities(
         force_refresh=force_refresh,
     )
 
-    candidates: List[Dict[str, Any]] = []
-    for symbol in symbols:
-        df = candles_map.get(symbol)
-        if df is None or df.empty:
-            continue
-        try:
-            features = compute_all(df)
-            snapshot = analyze_snapshot(features)
-            decision = snapshot["decision"]
-            scores = decision.get("scores", {})
-            action = decision.get("action", "hold")
-
-            decision_payload = {
-                "scores": scores,
-                "confidence": decision.get("confidence", 0.0),
-                "action": action,
-            }
-
-            if not _direction_match(action, direction):
-                continue
-
-            if not is_candidate(decision_payload, direction=direction):
-                continue
-
-            candidates.append(
-                {
-                    "ticker": symbol,
-                    "action": action,
-                    "score": float(scores.get("total", 0.0)),
-                    "confidence": float(decision.get("confidence", 0.0)),
-                    "rationale": decision.get("rationale", []),
-                    "risk_notes": decision.get("risk_notes", []),
-                    "data_source": df.attrs.get("source"),
-                    "reference_price": decision.get("reference_price"),
-                }
-            )
-        except Exception:
-            continue
+    # 指标计算为 CPU 密集型，批量放到线程池中执行，避免阻塞事件循环
+    features_map = await asyncio.to_thread(compute_all_batch, candles_map)
+
+    # 打分为纯 Python 的字典运算，整体放到线程中执行，避免阻塞事件循环
+    candidates = await asyncio.to_thread(
+        _score_candidates,
+        symbols,
+        features_map,
+        candles_map,
+        direction,
+    )
 
     candidates.sort(key=lambda item: abs(item.get("score", 0.0)), reverse=True)
     if limit:
@@ -100,6 +73,57 @@ async def scan_opportunities(
     }
 
 
+def _score_candidates(
+    symbols: List[str],
+    features_map: Dict[str, Dict[str, Any]],
+    candles_map: Dict[str, Any],
+    direction: str,
+) -> List[Dict[str, Any]]:
+    candidates: List[Dict[str, Any]] = []
+    for symbol in symbols:
+        features = features_map.get(symbol)
+        if features is None:
+            continue
+        candidate = _score_symbol(symbol, features, candles_map[symbol], direction)
+        if candidate is not None:
+            candidates.append(candidate)
+    return candidates
+
+
+def _score_symbol(symbol: str, features: Dict[str, Any], df: Any, direction: str) -> Optional[Dict[str, Any]]:
+    """对单只股票打分，不满足方向或筛选条件、或分析失败时返回 None。"""
+    try:
+        snapshot = analyze_snapshot(features)
+        decision = snapshot["decision"]
+        scores = decision.get("scores", {})
+        action = decision.get("action", "hold")
+
+        decision_payload = {
+            "scores": scores,
+            "confidence": decision.get("confidence", 0.0),
+            "action": action,
+        }
+
+        if not _direction_match(action, direction):
+            return None
+
+        if not is_candidate(decision_payload, direction=direction):
+            return None
+
+        return {
+            "ticker": symbol,
+            "action": action,
+            "score": float(scores.get("total", 0.0)),
+            "confidence": float(decision.get("confidence", 0.0)),
+            "rationale": decision.get("rationale", []),
+            "risk_notes": decision.get("risk_notes", []),
+            "data_source": df.attrs.get("source"),
+            "reference_price": decision.get("reference_price"),
+        }
+    except Exception:
+        return None
+
+
 def _direction_match(action: str, direction: str) -> bool:
     if direction == "all":
         return action in {"buy", "sell"}
@@ -11,8 +11,9 @@ import logging
 import os
 from datetime import datetime, timedelta
 from threading import Lock
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -365,6 +366,22 @@ def get_latest_trade_date(offset: int = 0) -> Optional[str]:
     return df.iloc[-1 - offset]["cal_date"]
 
 
+def _top_bottom_rows(frame: pd.DataFrame, column: str, k: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """一次 argpartition 同时选出 column 最大与最小的 k 行，两者均按降序排列。"""
+
+    values = frame[column].to_numpy(dtype=float)
+    n = len(values)
+    k = min(k, n)
+    if k <= 0:
+        return frame.iloc[:0], frame.iloc[:0]
+    order = np.argpartition(values, sorted({k - 1, n - k}))
+    top_idx = order[n - k:]
+    bottom_idx = order[:k]
+    top_idx = top_idx[np.argsort(-values[top_idx], kind="stable")]
+    bottom_idx = bottom_idx[np.argsort(-values[bottom_idx], kind="stable")]
+    return frame.iloc[top_idx], frame.iloc[bottom_idx]
+
+
 def compute_industry_rankings(daily_df: pd.DataFrame, stock_basic: pd.DataFrame, top_n: int = 5) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """根据当日行情与 stock_basic 中的行业字段计算行业涨跌排行。"""
     if daily_df.empty or stock_basic.empty:
@@ -383,32 +400,43 @@ def compute_industry_rankings(daily_df: pd.DataFrame, stock_basic: pd.DataFrame,
         change_pct=("pct_chg", "mean"),
         amount=("amount", "sum"),
     )
-    grouped = grouped.dropna(subset=["change_pct"]).sort_values("change_pct", ascending=False)
+    grouped = grouped.dropna(subset=["change_pct"])
 
-    top = grouped.head(top_n).reset_index()
-    bottom = grouped.tail(top_n).reset_index()
-    return top, bottom
+    # 只需首尾 top_n 个行业：一次部分划分取出两端，仅对这 2k 行排序
+    top, bottom = _top_bottom_rows(grouped, "change_pct", top_n)
+    return top.reset_index(), bottom.reset_index()
 
 
-def select_leaders(
-    industry: str,
+def select_leaders_by_industry(
+    industries: Iterable[str],
     daily_df: pd.DataFrame,
     stock_basic: pd.DataFrame,
     ascending: bool,
     limit: int = 3,
-) -> pd.DataFrame:
+) -> Dict[str, pd.DataFrame]:
+    """一次合并后批量选出多个行业的龙头股，避免逐个行业重复 merge。"""
+
     if daily_df.empty or stock_basic.empty:
-        return pd.DataFrame()
+        return {}
+    wanted = [industry for industry in industries if isinstance(industry, str) and industry]
+    if not wanted:
+        return {}
     merged = daily_df.merge(
         stock_basic[["ts_code", "name", "industry"]],
         on="ts_code",
         how="left",
     )
-    subset = merged[merged["industry"] == industry].copy()
+    subset = merged[merged["industry"].isin(wanted)]
     if subset.empty:
-        return pd.DataFrame()
-    subset = subset.sort_values("pct_chg", ascending=ascending)
-    return subset.head(limit)[["ts_code", "name", "pct_chg"]]
+        return {}
+    # 一次稳定排序后分组取前 N：同涨跌幅时保持原始行序
+    subset = subset.sort_values("pct_chg", ascending=ascending, kind="mergesort")
+    heads = subset.groupby("industry", sort=False).head(limit)
+    columns = ["ts_code", "name", "pct_chg"]
+    return {
+        industry: group[columns]
+        for industry, group in heads.groupby("industry", sort=False)
+    }
 
 
 def format_trade_dates(
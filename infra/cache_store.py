@@ -7,12 +7,16 @@ Redis 与 Mongo 的启用与参数均由 .env 控制，TTL 参考 TradingAgents-
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from io import StringIO
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Union
 
 import pandas as pd
 
@@ -73,21 +77,29 @@ class RedisAdapter:
             self.client = None
             self.enabled = False
 
-    def get(self, key: str) -> Optional[str]:
+    def get_bytes(self, key: str) -> Optional[bytes]:
         if not self.enabled or self.client is None:
             return None
         try:
             raw = self.client.get(key)
-            if raw is None:
-                return None
-            if isinstance(raw, bytes):
-                return raw.decode("utf-8")
-            return str(raw)
         except Exception as exc:  # pragma: no cover
             logger.debug("Redis 读取失败 %s: %s", key, exc)
             return None
+        if raw is None:
+            return None
+        return raw if isinstance(raw, bytes) else str(raw).encode("utf-8")
 
-    def set(self, key: str, payload: str, ttl: int) -> None:
+    def get(self, key: str) -> Optional[str]:
+        raw = self.get_bytes(key)
+        if raw is None:
+            return None
+        try:
+            return raw.decode("utf-8")
+        except UnicodeDecodeError as exc:  # pragma: no cover
+            logger.debug("Redis 数据非文本 %s: %s", key, exc)
+            return None
+
+    def set(self, key: str, payload: Union[str, bytes], ttl: int) -> None:
         if not self.enabled or self.client is None:
             return
         try:
@@ -141,7 +153,7 @@ class MongoAdapter:
             return None
         return doc.get("payload")
 
-    def set(self, key: str, payload: str, ttl: int) -> None:
+    def set(self, key: str, payload: Union[str, bytes], ttl: int) -> None:
         if not self.enabled or self.collection is None:
             return
         expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
@@ -152,6 +164,53 @@ class MongoAdapter:
             logger.debug("MongoDB 写入失败 %s: %s", key, exc)
 
 
+class FileKVAdapter:
+    """本地文件 L3 键值缓存：每个键一个文件，文件修改时间记录过期时刻。
+
+    写入先落临时文件再原子替换，多进程（如 uvicorn 多 worker）可安全共享；
+    进程重启后缓存依然有效。
+    """
+
+    def __init__(self, base_dir: Union[str, Path]) -> None:
+        self.enabled = _parse_bool("FILE_CACHE_ENABLED", True)
+        self.base_dir = Path(base_dir) / "kv"
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.base_dir / f"{digest}.bin"
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            if path.stat().st_mtime < time.time():
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as exc:  # pragma: no cover
+            logger.debug("文件缓存读取失败 %s: %s", key, exc)
+            return None
+
+    def set(self, key: str, payload: Union[str, bytes], ttl: int) -> None:
+        if not self.enabled:
+            return
+        data = payload.encode("utf-8") if isinstance(payload, str) else payload
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(data)
+            expires_at = time.time() + ttl
+            os.utime(tmp, (expires_at, expires_at))
+            os.replace(tmp, path)
+        except OSError as exc:  # pragma: no cover
+            logger.debug("文件缓存写入失败 %s: %s", key, exc)
+            tmp.unlink(missing_ok=True)
+
+
 class CacheManager:
     """统一的缓存管理器。"""
 
@@ -161,6 +220,7 @@ class CacheManager:
         self.mongo = MongoAdapter()
         base_dir = os.getenv("CACHE_DIR", "./cache")
         self.file_cache = DataCache(base_dir=base_dir)
+        self.file_kv = FileKVAdapter(base_dir)
 
         self.ttl_quote_fast = _parse_int("TTL_QUOTE_FAST", 30)
         self.ttl_intraday = _parse_int("TTL_INTRADAY", 60)
@@ -180,12 +240,53 @@ class CacheManager:
     def make_key(self, provider: str, ticker: str, interval: str) -> str:
         return f"{provider.lower()}::{ticker.upper()}::{interval.lower()}"
 
-    def load_json(self, key: str) -> Optional[Dict[str, Any]]:
+    def load_text(self, key: str) -> Optional[str]:
+        """读取已序列化的原始文本，供调用方自行反序列化。"""
         if not self.enabled:
             return None
         payload = self.redis.get(key)
         if payload is None:
             payload = self.mongo.get(key)
+        if payload is None:
+            raw = self.file_kv.get_bytes(key)
+            if raw is not None:
+                try:
+                    payload = raw.decode("utf-8")
+                except UnicodeDecodeError:  # pragma: no cover
+                    payload = None
+        return payload
+
+    def store_text(self, key: str, text: str, ttl: int) -> None:
+        """写入已序列化的文本，避免调用方重复序列化。"""
+        if not self.enabled or ttl <= 0:
+            return
+        self.redis.set(key, text, ttl)
+        self.mongo.set(key, text, ttl)
+        self.file_kv.set(key, text, ttl)
+
+    def load_bytes(self, key: str) -> Optional[bytes]:
+        """读取二进制载荷（如 msgpack），由调用方负责解码。"""
+        if not self.enabled:
+            return None
+        payload = self.redis.get_bytes(key)
+        if payload is None:
+            payload = self.mongo.get(key)
+        if payload is None:
+            payload = self.file_kv.get_bytes(key)
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        return payload
+
+    def store_bytes(self, key: str, payload: bytes, ttl: int) -> None:
+        """写入已编码好的二进制载荷。"""
+        if not self.enabled or ttl <= 0:
+            return
+        self.redis.set(key, payload, ttl)
+        self.mongo.set(key, payload, ttl)
+        self.file_kv.set(key, payload, ttl)
+
+    def load_json(self, key: str) -> Optional[Dict[str, Any]]:
+        payload = self.load_text(key)
         if payload is None:
             return None
         try:
@@ -202,8 +303,7 @@ class CacheManager:
         except Exception as exc:  # pragma: no cover
             logger.debug("JSON 序列化失败 %s: %s", key, exc)
             return
-        self.redis.set(key, text, ttl)
-        self.mongo.set(key, text, ttl)
+        self.store_text(key, text, ttl)
 
     def load_dataframe(self, provider: str, ticker: str, interval: str) -> Optional[pd.DataFrame]:
         if not self.enabled:
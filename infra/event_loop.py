@@ -0,0 +1,32 @@
+"""
+脚本入口的事件循环选择。
+
+uvicorn[standard] 已自带 uvloop，API 服务会自动使用；调度器与手动脚本通过
+`run()` 启动协程时同样优先使用 uvloop，未安装或设置 `DISABLE_UVLOOP=1`
+时回退到标准 asyncio。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Coroutine, TypeVar
+
+try:  # pragma: no cover - 可选依赖
+    import uvloop
+except ImportError:  # pragma: no cover
+    uvloop = None  # type: ignore
+
+T = TypeVar("T")
+
+
+def uvloop_enabled() -> bool:
+    return uvloop is not None and os.getenv("DISABLE_UVLOOP") != "1"
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """等价于 asyncio.run，可用时改用 uvloop 事件循环。"""
+
+    if uvloop_enabled():
+        return uvloop.run(main)
+    return asyncio.run(main)
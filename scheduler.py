@@ -23,13 +23,14 @@ from fastapi.encoders import jsonable_encoder
 from zoneinfo import ZoneInfo
 
 from datahub.fetcher import get_candles_batch
-from datahub.indicators import compute_all
+from datahub.indicators import compute_all_batch
 from datahub.macro import get_macro_snapshot
 from datahub.scanner import scan_opportunities
 from datahub.watchlist import load_watchlist
 from engine.analyzer import analyze_snapshot
 from engine.macro_analyzer import summarize_for_report, summarize_macro
 from engine.report import render, render_daily_report
+from infra.event_loop import run as run_event_loop
 
 try:  # noqa: WPS433 - 可选依赖
     from llm import LLMClient, LLMNotConfigured
@@ -61,13 +62,15 @@ async def generate_daily_report(timeframe: str = "1d") -> Dict[str, Any]:
     failed: List[str] = []
     latest_ts: Optional[datetime] = None
 
+    features_map = await asyncio.to_thread(compute_all_batch, candles_map)
+
     for symbol in watchlist.symbols:
         df = candles_map.get(symbol)
-        if df is None or df.empty:
+        features = features_map.get(symbol)
+        if df is None or features is None:
             failed.append(symbol)
             continue
         try:
-            features = compute_all(df)
             snapshot = analyze_snapshot(features)
             decision = snapshot["decision"]
             report_text = render(decision)
@@ -261,4 +264,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_event_loop(main())
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import sys
 from pathlib import Path
@@ -13,13 +12,14 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 import env  # noqa: F401
+from infra.event_loop import run as run_event_loop  # noqa: E402
 from scheduler import generate_daily_report  # noqa: E402
 
 logging.basicConfig(level=logging.INFO)
 
 
 def main() -> None:
-    asyncio.run(generate_daily_report())
+    run_event_loop(generate_daily_report())
 
 
 if __name__ == "__main__":